@@ -0,0 +1,86 @@
+import re
+import sys
+import argparse
+from time import perf_counter
+from tabulate import tabulate
+from hbase import HBase
+from wal import DURABILITY_LEVELS
+from commandSelector import commandSelector
+
+# Modo batch, sin interfaz gráfica: ejecuta los comandos de un archivo (uno por línea) o de
+# la entrada estándar mediante commandSelector y al final informa el throughput y la latencia
+# acumulada de cada comando. Las líneas vacías y las que empiezan con '#' se ignoran.
+#
+#   python -m batch run script.hbase
+#   cat comandos.log | python -m batch run - --quiet --single-flush
+
+ANSI = re.compile(r'\033\[\d+m')
+
+def readCommands(lines):
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+def runBatch(hbase, commands, output=None, plain=False):
+    # Devuelve {comando: [latencias en segundos]} y el tiempo total
+    latencies = {}
+    inicio = perf_counter()
+    for command in commands:
+        start = perf_counter()
+        result = commandSelector(hbase, command)
+        latencies.setdefault(command.split(' ')[0].lower(), []).append(perf_counter() - start)
+        if output is not None:
+            result = ANSI.sub('', str(result)) if plain else str(result)
+            output.write(f'{"" if plain else "hbase>>> "}{command}\n{result}\n\n')
+    return latencies, perf_counter() - inicio
+
+def report(latencies, elapsed):
+    total = sum(len(values) for values in latencies.values())
+    data = []
+    for command in sorted(latencies, key=lambda c: -sum(latencies[c])):
+        values = latencies[command]
+        data.append([command, len(values), round(sum(values), 6), round(sum(values) / len(values) * 1000, 3),
+                     round(percentile(values, 0.5) * 1000, 3), round(percentile(values, 0.99) * 1000, 3)])
+    result = tabulate(data, headers=['command', 'count', 'total (s)', 'avg (ms)', 'p50 (ms)', 'p99 (ms)'])
+    result += f'\n\n{total} command(s) in {round(elapsed, 6)} seconds, {round(total / elapsed, 1) if elapsed else 0} commands/s'
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m batch', description='Ejecuta comandos de HBase sin interfaz gráfica')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+    run = subparsers.add_parser('run', help='ejecuta un archivo de comandos (- para la entrada estándar)')
+    run.add_argument('script')
+    run.add_argument('--quiet', action='store_true', help='no muestra el resultado de cada comando')
+    run.add_argument('--plain', action='store_true', help='quita los colores ANSI de los resultados')
+    run.add_argument('--single-flush', action='store_true', help='no vuelca las MemStores hasta terminar el batch')
+    run.add_argument('--durability', choices=DURABILITY_LEVELS, default='batch', help='cuándo se hace fsync del WAL (ver wal.py)')
+    args = parser.parse_args(argv)
+
+    # Con --single-flush todas las escrituras quedan en la MemStore (y en el WAL) y se vuelcan una sola vez al final
+    options = {'memstoreFlushSize': float('inf')} if args.single_flush else {}
+    hbase = HBase(walDurability=args.durability, **options)
+    script = sys.stdin if args.script == '-' else open(args.script, 'r', encoding='utf-8')
+    try:
+        latencies, elapsed = runBatch(hbase, readCommands(script), None if args.quiet else sys.stdout, args.plain)
+    finally:
+        if script is not sys.stdin:
+            script.close()
+
+    # Con --durability async puede haber escrituras sin fsync
+    hbase.syncWALs()
+
+    if args.single_flush:
+        inicio = perf_counter()
+        cells = hbase.flushAll()
+        flush = perf_counter() - inicio
+        elapsed += flush
+        print(f'Flushed {cells} cell(s) in {round(flush, 6)} seconds\n', file=sys.stderr)
+    print(report(latencies, elapsed), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import threading
+from time import perf_counter
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hbase import HBase
+from wal import DURABILITY_LEVELS
+
+# Throughput de put con cada nivel de durabilidad del WAL ('op', 'batch' y 'async', ver wal.py)
+# y distinta cantidad de hilos escribiendo en la misma tabla. Cada medición usa un directorio
+# nuevo y una MemStore que no se vuelca, así que solo se mide el WAL. La cantidad de fsyncs sale
+# de la métrica wal_sync: con 'batch' varios puts concurrentes comparten un fsync.
+#
+# El directorio debe estar en el disco que se quiere medir (en tmpfs fsync no cuesta nada).
+#
+# Uso: python benchmarks/durability.py [--threads 1,4,16] [--puts 400] [--dir /ruta] [--sync-interval 1.0]
+
+def measure(durability, threads, puts, directory, syncInterval):
+    os.chdir(tempfile.mkdtemp(prefix='hbase_durability_', dir=directory))
+    hbase = HBase(memstoreFlushSize=float('inf'), walDurability=durability, walSyncInterval=syncInterval)
+    hbase.createTable('durability', ['a'])
+    latencies = [[] for _ in range(threads)]
+
+    def write(t):
+        for i in range(puts):
+            start = perf_counter()
+            hbase.putRow('durability', f't{t}#{i:06d}', 'a:x', 'x' * 100)
+            latencies[t].append(perf_counter() - start)
+
+    workers = [threading.Thread(target=write, args=(t,)) for t in range(threads)]
+    inicio = perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = perf_counter() - inicio
+
+    syncs = hbase.metrics.snapshot('default:durability')['histograms'].get('wal_sync', {}).get('default:durability', {}).get('count', 0)
+    values = sorted(v for values in latencies for v in values)
+    total = len(values)
+    shutil.rmtree(os.getcwd(), ignore_errors=True)
+    return [durability, threads, round(total / elapsed, 1), syncs, round(total / syncs, 2) if syncs else '-',
+            round(values[total // 2] * 1000, 3), round(values[min(int(total * 0.99), total - 1)] * 1000, 3)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python benchmarks/durability.py', description='Throughput de put con cada nivel de durabilidad del WAL')
+    parser.add_argument('--threads', default='1,4,16', help='cantidades de hilos escritores')
+    parser.add_argument('--puts', type=int, default=400, help='puts por hilo')
+    parser.add_argument('--dir', default=os.getcwd(), help='directorio donde se crean los datos')
+    parser.add_argument('--sync-interval', type=float, default=1.0, help="walSyncInterval con 'async'")
+    args = parser.parse_args(argv)
+
+    directory = os.path.abspath(args.dir)
+    results = []
+    for durability in DURABILITY_LEVELS:
+        for threads in [int(n) for n in args.threads.split(',')]:
+            results.append(measure(durability, threads, args.puts, directory, args.sync_interval))
+    print(tabulate(results, headers=['durability', 'threads', 'puts/s', 'fsyncs', 'puts/fsync', 'p50 (ms)', 'p99 (ms)']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import random
+from time import perf_counter
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from memstore import MemStore
+
+# Micro-benchmark de la MemStore: mide el costo promedio de un put a medida que crece
+# la cantidad de filas, con row_Id no numéricos insertados en orden aleatorio.
+# Uso: python benchmarks/memstore_put.py [filas]
+
+def main(total=200_000, batches=10):
+    keys = [f'user#{i}' for i in range(total)]
+    random.seed(42)
+    random.shuffle(keys)
+
+    memstore = MemStore()
+    batch = total // batches
+    results = []
+    for b in range(batches):
+        inicio = perf_counter()
+        for rowId in keys[b * batch:(b + 1) * batch]:
+            memstore.put(rowId, 'cf', 'col', '1.0', 'value')
+        elapsed = perf_counter() - inicio
+        results.append([(b + 1) * batch, round(elapsed / batch * 1e6, 3)])
+
+    inicio = perf_counter()
+    cells = sum(1 for _ in memstore.cells())
+    scan = perf_counter() - inicio
+
+    print(tabulate(results, headers=['rows in memstore', 'put (us)']))
+    print(f'\nOrdered scan of {cells} cells in {round(scan, 4)} seconds')
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
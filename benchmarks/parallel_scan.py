@@ -0,0 +1,58 @@
+import os
+import sys
+import random
+import tempfile
+from time import perf_counter
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hbase import HBase
+
+# Benchmark de lectura en paralelo: carga una tabla repartida en muchos HFiles (con una
+# MemStore y regiones pequeñas) y mide un scan completo (count EXACT) con distinta cantidad
+# de workers, con hilos y con procesos. El block cache se desactiva para que cada scan
+# decodifique todos los bloques.
+# Uso: python benchmarks/parallel_scan.py [filas]
+
+def load(rows):
+    hbase = HBase(memstoreFlushSize=256 * 1024, regionMaxSize=4 * 1024 * 1024)
+    hbase.createTable('bench', ['cf'])
+    random.seed(42)
+    keys = [f'user#{i:08d}' for i in range(rows)]
+    random.shuffle(keys)
+    for rowId in keys:
+        for column in ('a', 'b', 'c'):
+            hbase.putRow('bench', rowId, f'cf:{column}', 'x' * 40)
+    hbase.flushMemStore(hbase.verifyTable('bench'))
+    regions = hbase.getRegions('default', 'bench')
+    return len(regions), sum(len(r['files']) for r in regions)
+
+def measure(workers, mode, repeat=3):
+    hbase = HBase(blockCacheSize=0, readWorkers=workers, readExecutor=mode)
+    table = hbase.verifyTable('bench')
+    best = None
+    for _ in range(repeat):
+        inicio = perf_counter()
+        cells = sum(1 for _ in hbase.scanCells(table))
+        elapsed = perf_counter() - inicio
+        best = elapsed if best is None else min(best, elapsed)
+    hbase.reader.shutdown()
+    return cells, best
+
+def main(rows=60_000, workerCounts=(1, 2, 4, 8)):
+    os.chdir(tempfile.mkdtemp(prefix='hbase_bench_'))
+    regions, files = load(rows)
+    print(f'{rows} rows in {regions} region(s) and {files} HFile(s), {os.cpu_count()} CPU(s)\n')
+
+    results = []
+    base = None
+    for mode in ('thread', 'process'):
+        for workers in workerCounts:
+            cells, elapsed = measure(workers, mode)
+            base = base or elapsed
+            results.append([mode, workers, cells, round(elapsed, 4), round(base / elapsed, 2)])
+    print(tabulate(results, headers=['executor', 'workers', 'cells', 'scan (s)', 'speedup']))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60_000)
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+from time import perf_counter
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hbase import HBase
+from renderer import renderScan
+
+# Compara un scan completo con la API sin formato (HBase.scan) contra el mismo scan
+# formateado para el shell (renderer.renderScan, con tabulate y colores ANSI).
+# Uso: python benchmarks/scan_render.py [celdas]
+
+def load(hbase, cells):
+    hbase.createTable('bench', ['cf'])
+    for i in range(cells // 4):
+        for column in ('a', 'b', 'c', 'd'):
+            hbase.putRow('bench', f'user#{i:08d}', f'cf:{column}', f'value-{i}')
+    hbase.flushMemStore(hbase.verifyTable('bench'))
+
+def timed(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        inicio = perf_counter()
+        result = function()
+        elapsed = perf_counter() - inicio
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main(cells=100_000):
+    os.chdir(tempfile.mkdtemp(prefix='hbase_bench_'))
+    hbase = HBase(memstoreFlushSize=64 * 1024 * 1024, regionMaxSize=1024 * 1024 * 1024)
+    load(hbase, cells)
+
+    count, raw = timed(lambda: sum(1 for _ in hbase.scan('bench')))
+    _, values = timed(lambda: [cell.value for cell in hbase.scan('bench')])
+    text, rendered = timed(lambda: renderScan(hbase.scan('bench'), limit=cells))
+
+    results = [
+        ['HBase.scan (iterar)', count, round(raw, 4), 1],
+        ['HBase.scan (leer valores)', count, round(values, 4), round(values / raw, 2)],
+        ['renderScan (shell)', count, round(rendered, 4), round(rendered / raw, 2)],
+    ]
+    print(tabulate(results, headers=['path', 'cells', 'seconds', 'x raw']))
+    print(f'\nRendered output: {len(text)} characters')
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
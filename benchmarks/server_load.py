@@ -0,0 +1,84 @@
+import os
+import sys
+import socket
+import tempfile
+import threading
+import subprocess
+from time import perf_counter, sleep
+from tabulate import tabulate
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from client import HBaseClient
+
+# Prueba de carga del servidor TCP: inicia server.py en un directorio temporal y ejecuta
+# varios clientes en paralelo con una mezcla de put y get. Informa el throughput y las
+# latencias p50/p99, sin pipelining y con pipelining.
+# Uso: python benchmarks/server_load.py [clientes] [peticiones por cliente]
+
+def freePort():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def startServer(port):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'), '--port', str(port)],
+                               cwd=tempfile.mkdtemp(prefix='hbase_server_'), stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return process
+        except ConnectionRefusedError:
+            sleep(0.1)
+    process.kill()
+    raise RuntimeError('El servidor no inició')
+
+def commands(client, requests):
+    for i in range(requests):
+        rowId = f'user#{client}-{i // 2}'
+        if i % 2 == 0:
+            yield f'put bench {rowId} cf:value {"x" * 32}'
+        else:
+            yield f'get bench {rowId}'
+
+def runClient(port, client, requests, window, latencies):
+    with HBaseClient('127.0.0.1', port) as conn:
+        pending = list(commands(client, requests))
+        for start in range(0, requests, window):
+            batch = pending[start:start + window]
+            inicio = perf_counter()
+            conn.pipeline(batch, window=window)
+            # Con pipelining cada petición se cuenta con la latencia de su lote
+            latencies.extend([(perf_counter() - inicio) * 1000] * len(batch))
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+def run(port, clients, requests, window):
+    latencies = []
+    threads = [threading.Thread(target=runClient, args=(port, c, requests, window, latencies)) for c in range(clients)]
+    inicio = perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = perf_counter() - inicio
+    return [clients, window, len(latencies), round(len(latencies) / elapsed, 1),
+            round(percentile(latencies, 0.5), 3), round(percentile(latencies, 0.99), 3)]
+
+def main(clients=8, requests=500):
+    port = freePort()
+    server = startServer(port)
+    try:
+        with HBaseClient('127.0.0.1', port) as conn:
+            conn.execute("create bench 'cf'")
+        results = [run(port, c, requests, w) for c in (1, clients) for w in (1, 16)]
+    finally:
+        server.terminate()
+        server.wait()
+    print(tabulate(results, headers=['clients', 'pipeline', 'requests', 'req/s', 'p50 (ms)', 'p99 (ms)']))
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
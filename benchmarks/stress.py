@@ -0,0 +1,180 @@
+import os
+import sys
+import random
+import argparse
+from collections import Counter
+import tempfile
+import threading
+from contextlib import nullcontext
+from time import perf_counter
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hbase import HBase
+
+# Prueba de concurrencia de HBase, llamando directamente a la clase en un directorio temporal.
+#
+# check: varios hilos escriben a la vez en la misma tabla (cada uno sus filas, en orden, y una
+# columna propia de unas filas compartidas) con MemStores chicas, así que hay flushes, splits y
+# compactaciones durante la prueba. Mientras tanto otros hilos hacen scans, que deben ver de
+# cada escritor un prefijo sin huecos de sus filas (una snapshot), y gets de filas ya escritas,
+# que siempre deben encontrarse. Al final no debe faltar ninguna celda.
+#
+# scale: throughput de gets con 1..N hilos lectores mientras un hilo escribe, con el lock por
+# tabla y con un único lock para todas las operaciones (como se ejecutaban antes los comandos).
+#
+# Uso: python benchmarks/stress.py [check|scale|all] [--writers 4] [--rows 500] [--threads 1,2,4,8] [--seconds 2]
+
+SHARED_ROWS = 10
+
+def writer(hbase, w, rows, progress):
+    for i in range(rows):
+        hbase.putRow('stress', f'w{w}#{i:06d}', 'a:x', str(i))
+        hbase.putRow('stress', f'shared#{i % SHARED_ROWS}', f'a:w{w}', str(i))
+        progress[w] = i + 1
+
+def scanner(hbase, writers, done, stats):
+    while not done.is_set():
+        seen = {w: [] for w in range(writers)}
+        for cell in hbase.scan('stress', 'w', 'x', ['a:x']):
+            w, i = cell.row[1:].split('#')
+            seen[int(w)].append(int(i))
+        stats['scans'] += 1
+        # Cada escritor escribe sus filas en orden: una snapshot ve un prefijo
+        stats['gaps'] += sum(1 for indices in seen.values() if indices != list(range(len(indices))))
+
+def getter(hbase, progress, done, stats):
+    while not done.is_set():
+        w = random.randrange(len(progress))
+        if not progress[w]:
+            continue
+        i = random.randrange(progress[w])
+        if not len(hbase.get('stress', f'w{w}#{i:06d}', ['a:x'])):
+            stats['misses'] += 1
+        stats['gets'] += 1
+
+def run(target, args, errors):
+    try:
+        target(*args)
+    except Exception as e:
+        errors.append(repr(e))
+
+def check(writers=4, rows=500):
+    os.chdir(tempfile.mkdtemp(prefix='hbase_stress_'))
+    hbase = HBase(memstoreFlushSize=16 * 1024, regionMaxSize=64 * 1024, compactionThreshold=3, compactionInterval=0.2)
+    hbase.createTable('stress', ['a'])
+
+    progress = [0] * writers
+    done = threading.Event()
+    # Un contador por hilo lector, que se suman al final
+    counters = [Counter() for _ in range(4)]
+    errors = []
+    writerThreads = [threading.Thread(target=run, args=(writer, (hbase, w, rows, progress), errors)) for w in range(writers)]
+    readerThreads = [threading.Thread(target=run, args=(scanner, (hbase, writers, done, counters[i]), errors)) for i in range(2)]
+    readerThreads += [threading.Thread(target=run, args=(getter, (hbase, progress, done, counters[i]), errors)) for i in range(2, 4)]
+
+    inicio = perf_counter()
+    for t in writerThreads + readerThreads:
+        t.start()
+    for t in writerThreads:
+        t.join()
+    done.set()
+    for t in readerThreads:
+        t.join()
+    elapsed = perf_counter() - inicio
+    stats = sum(counters, Counter())
+
+    found = {}
+    for cell in hbase.scan('stress'):
+        found[(cell.row, cell.column)] = cell.value
+    lost = sum(1 for w in range(writers) for i in range(rows) if found.get((f'w{w}#{i:06d}', 'x')) != str(i))
+    lost += sum(1 for w in range(writers) for r in range(SHARED_ROWS) if (f'shared#{r}', f'w{w}') not in found)
+
+    metrics = hbase.metrics.snapshot('default:stress')
+    results = [
+        ['puts', writers * rows * 2],
+        ['lost updates', lost],
+        ['scans', stats['scans']],
+        ['scans with gaps', stats['gaps']],
+        ['gets', stats['gets']],
+        ['gets missing a written row', stats['misses']],
+        ['errors', len(errors)],
+        ['flushes', metrics['histograms'].get('flush', {}).get('default:stress', {}).get('count', 0)],
+        ['region splits', metrics['counters'].get('region.splits', {}).get('default:stress', 0)],
+        ['compactions', metrics['counters'].get('compaction.minor', {}).get('default:stress', 0)],
+        ['seconds', round(elapsed, 3)],
+    ]
+    print(tabulate(results, headers=['check', 'value']))
+    for error in errors[:5]:
+        print(error)
+    return lost == 0 and stats['gaps'] == 0 and stats['misses'] == 0 and not errors
+
+def measure(hbase, threads, seconds, rows, lock):
+    done = threading.Event()
+    counts = {'gets': 0, 'puts': 0}
+    countLock = threading.Lock()
+
+    def read():
+        gets = 0
+        while not done.is_set():
+            with lock:
+                hbase.get('scale', f'row#{random.randrange(rows):06d}')
+            gets += 1
+        with countLock:
+            counts['gets'] += gets
+
+    def write():
+        i = 0
+        while not done.is_set():
+            with lock:
+                hbase.putRow('scale', f'row#{i % rows:06d}', 'a:x', str(i))
+            counts['puts'] += 1
+            i += 1
+
+    workers = [threading.Thread(target=read) for _ in range(threads)] + [threading.Thread(target=write)]
+    for t in workers:
+        t.start()
+    done.wait(seconds)
+    done.set()
+    for t in workers:
+        t.join()
+    return counts['gets'] / seconds, counts['puts'] / seconds
+
+def scale(threads=(1, 2, 4, 8), seconds=2, rows=2000):
+    os.chdir(tempfile.mkdtemp(prefix='hbase_stress_'))
+    hbase = HBase(memstoreFlushSize=1024 * 1024, regionMaxSize=64 * 1024 * 1024)
+    hbase.createTable('scale', ['a'])
+    for i in range(rows):
+        hbase.putRow('scale', f'row#{i:06d}', 'a:x', str(i))
+    hbase.flushMemStore(hbase.verifyTable('scale'))
+
+    results = []
+    for mode, lock in (('global lock', threading.Lock()), ('table locks', nullcontext())):
+        base = None
+        for n in threads:
+            gets, puts = measure(hbase, n, seconds, rows, lock)
+            base = base or gets
+            results.append([mode, n, round(gets, 1), round(gets / base, 2), round(puts, 1), round(gets + puts, 1)])
+    print(tabulate(results, headers=['locking', 'reader threads', 'gets/s', 'x 1 thread', 'puts/s (1 writer)', 'ops/s']))
+    print(f'\n{os.cpu_count()} CPU(s)')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python benchmarks/stress.py', description='Prueba de concurrencia de HBase')
+    parser.add_argument('mode', nargs='?', choices=['check', 'scale', 'all'], default='all')
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=500, help='filas por escritor en check')
+    parser.add_argument('--threads', default='1,2,4,8', help='cantidades de hilos lectores en scale')
+    parser.add_argument('--seconds', type=float, default=2)
+    args = parser.parse_args(argv)
+
+    ok = True
+    if args.mode in ('check', 'all'):
+        ok = check(args.writers, args.rows)
+    if args.mode in ('scale', 'all'):
+        print()
+        scale([int(n) for n in args.threads.split(',')], args.seconds)
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+# Benchmark con las cargas de trabajo de YCSB (A-F) sobre la clase HBase.
+# Uso: python -m benchmarks.ycsb run --workload a b c --output resultados.json
+#      python -m benchmarks.ycsb compare base.json nuevo.json
@@ -0,0 +1,94 @@
+import os
+import sys
+import ast
+import json
+import argparse
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from .runner import runWorkload, environment
+from .workloads import WORKLOADS
+from .generators import DISTRIBUTIONS
+
+def parseProperties(values):
+    # --property memstoreFlushSize=1048576 --property bloomFilter=ROWCOL
+    properties = {}
+    for value in values or []:
+        key, _, literal = value.partition('=')
+        try:
+            properties[key] = ast.literal_eval(literal)
+        except (ValueError, SyntaxError):
+            properties[key] = literal
+    return properties
+
+def summaryTable(results):
+    data = []
+    for result in results:
+        workload = result['config']['workload'].upper()
+        for phase in ('load', 'run'):
+            for operation, latency in result[phase]['latency_us'].items():
+                data.append([workload, phase, operation, latency['count'], result[phase]['throughput'],
+                             latency['avg'], latency['p50'], latency['p95'], latency['p99']])
+    return tabulate(data, headers=['workload', 'phase', 'operation', 'count', 'ops/s', 'avg (us)', 'p50 (us)', 'p95 (us)', 'p99 (us)'])
+
+def run(args):
+    results = []
+    for workload in args.workload:
+        print(f'Workload {workload.upper()} ({WORKLOADS[workload]["description"]})...', file=sys.stderr)
+        results.append(runWorkload(workload, args.records, args.operations, args.fields, args.field_length,
+                                   args.max_scan_length, args.distribution, args.seed, parseProperties(args.property), args.keep_data))
+    report = {'environment': environment(), 'results': results}
+    print(summaryTable(results))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nResults written to {args.output}')
+
+def change(old, new):
+    return f'{round((new - old) / old * 100, 1):+}%' if old else '-'
+
+def compare(args):
+    # Compara dos archivos de resultados: throughput y p99 de cada operación de la fase run
+    with open(args.base) as f:
+        base = {r['config']['workload']: r for r in json.load(f)['results']}
+    with open(args.new) as f:
+        new = {r['config']['workload']: r for r in json.load(f)['results']}
+
+    data = []
+    for workload in sorted(base.keys() & new.keys()):
+        old, current = base[workload]['run'], new[workload]['run']
+        data.append([workload.upper(), 'ALL', 'ops/s', old['throughput'], current['throughput'], change(old['throughput'], current['throughput'])])
+        for operation in sorted(old['latency_us'].keys() & current['latency_us'].keys()):
+            a, b = old['latency_us'][operation]['p99'], current['latency_us'][operation]['p99']
+            data.append([workload.upper(), operation, 'p99 (us)', a, b, change(a, b)])
+    print(tabulate(data, headers=['workload', 'operation', 'metric', args.base, args.new, 'change']))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ycsb', description='Cargas de trabajo de YCSB sobre HBase')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+
+    runParser = subparsers.add_parser('run', help='ejecuta una o varias cargas de trabajo')
+    runParser.add_argument('--workload', nargs='+', choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    runParser.add_argument('--records', type=int, default=1000)
+    runParser.add_argument('--operations', type=int, default=1000)
+    runParser.add_argument('--fields', type=int, default=10)
+    runParser.add_argument('--field-length', type=int, default=100)
+    runParser.add_argument('--max-scan-length', type=int, default=100)
+    runParser.add_argument('--distribution', choices=sorted(DISTRIBUTIONS), help='reemplaza la distribución de la carga')
+    runParser.add_argument('--seed', type=int, default=42)
+    runParser.add_argument('--property', action='append', help='parámetro de HBase(), por ejemplo memstoreFlushSize=1048576')
+    runParser.add_argument('--keep-data', action='store_true', help='no borra el directorio temporal de datos')
+    runParser.add_argument('--output', help='archivo JSON con los resultados')
+    runParser.set_defaults(function=run)
+
+    compareParser = subparsers.add_parser('compare', help='compara dos archivos de resultados')
+    compareParser.add_argument('base')
+    compareParser.add_argument('new')
+    compareParser.set_defaults(function=compare)
+
+    args = parser.parse_args(argv)
+    args.function(args)
+
+if __name__ == '__main__':
+    main()
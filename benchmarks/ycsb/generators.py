@@ -0,0 +1,86 @@
+import random
+
+# Generadores de claves de YCSB. Devuelven números de registro en [0, items); la clave de
+# cada registro se obtiene con recordKey.
+
+FNV_OFFSET_BASIS_64 = 0xCBF29CE484222325
+FNV_PRIME_64 = 1099511628211
+MASK_64 = (1 << 64) - 1
+
+def fnvhash64(value):
+    # FNV-1a de 64 bits sobre los 8 bytes del número, como en YCSB
+    h = FNV_OFFSET_BASIS_64
+    for _ in range(8):
+        h ^= value & 0xFF
+        h = (h * FNV_PRIME_64) & MASK_64
+        value >>= 8
+    return h
+
+def recordKey(keynum, ordered=False):
+    # Como en YCSB, las claves se dispersan con un hash para que los inserts no lleguen en orden
+    return f'user{keynum if ordered else fnvhash64(keynum)}'
+
+class UniformGenerator:
+    def __init__(self, rng):
+        self.rng = rng
+
+    def next(self, items):
+        return self.rng.randrange(items)
+
+class ZipfianGenerator:
+    # Algoritmo de Gray et al. ("Quickly generating billion-record synthetic databases") usado
+    # por YCSB. zeta(n) se actualiza de forma incremental cuando crece la cantidad de registros
+    ZIPFIAN_CONSTANT = 0.99
+
+    def __init__(self, rng, theta=ZIPFIAN_CONSTANT):
+        self.rng = rng
+        self.theta = theta
+        self.alpha = 1 / (1 - theta)
+        self.zeta2 = self.zeta(0, 2, 0)
+        self.items = 0
+        self.zetan = 0
+
+    def zeta(self, start, end, initial):
+        total = initial
+        for i in range(start, end):
+            total += 1 / (i + 1) ** self.theta
+        return total
+
+    def next(self, items):
+        if items != self.items:
+            self.zetan = self.zeta(self.items, items, self.zetan) if items > self.items else self.zeta(0, items, 0)
+            self.items = items
+            self.eta = (1 - (2 / items) ** (1 - self.theta)) / (1 - self.zeta2 / self.zetan)
+
+        u = self.rng.random()
+        uz = u * self.zetan
+        if uz < 1:
+            return 0
+        if uz < 1 + 0.5 ** self.theta:
+            return 1 if items > 1 else 0
+        return min(int(items * (self.eta * u - self.eta + 1) ** self.alpha), items - 1)
+
+class ScrambledZipfianGenerator:
+    # Zipfian cuyos elementos populares se reparten por todo el espacio de claves
+    def __init__(self, rng):
+        self.zipfian = ZipfianGenerator(rng)
+
+    def next(self, items):
+        return fnvhash64(self.zipfian.next(items)) % items
+
+class LatestGenerator:
+    # Zipfian sobre la antigüedad: los registros insertados más recientemente son los más leídos
+    def __init__(self, rng):
+        self.zipfian = ZipfianGenerator(rng)
+
+    def next(self, items):
+        return items - 1 - self.zipfian.next(items)
+
+DISTRIBUTIONS = {
+    'uniform': UniformGenerator,
+    'zipfian': ScrambledZipfianGenerator,
+    'latest': LatestGenerator,
+}
+
+def keyGenerator(distribution, seed=None):
+    return DISTRIBUTIONS[distribution](random.Random(seed))
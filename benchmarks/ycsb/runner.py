@@ -0,0 +1,133 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import platform
+import subprocess
+from time import perf_counter, time
+from datetime import datetime
+from .generators import keyGenerator, recordKey
+from .workloads import WORKLOADS, proportions
+
+from hbase import HBase
+
+TABLE = 'usertable'
+FAMILY = 'family'
+
+# Ejecuta una carga de trabajo sobre una instancia de HBase en un directorio temporal: primero
+# inserta recordCount registros (fase load) y luego ejecuta operationCount operaciones (fase
+# run). Cada operación llama a los métodos de HBase y se mide con perf_counter.
+
+class Measurements:
+    def __init__(self):
+        self.latencies = {}
+
+    def measure(self, operation, function, *args):
+        inicio = perf_counter()
+        function(*args)
+        self.latencies.setdefault(operation, []).append(perf_counter() - inicio)
+
+    def summary(self, elapsed):
+        operations = sum(len(values) for values in self.latencies.values())
+        result = {'operations': operations, 'seconds': round(elapsed, 6),
+                  'throughput': round(operations / elapsed, 2) if elapsed else 0, 'latency_us': {}}
+        for operation, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            result['latency_us'][operation.upper()] = {
+                'count': len(values),
+                'avg': round(sum(values) / len(values) * 1e6, 2),
+                'min': round(values[0] * 1e6, 2),
+                'p50': round(percentile(values, 0.50) * 1e6, 2),
+                'p95': round(percentile(values, 0.95) * 1e6, 2),
+                'p99': round(percentile(values, 0.99) * 1e6, 2),
+                'max': round(values[-1] * 1e6, 2),
+            }
+        return result
+
+def percentile(values, p):
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+class Client:
+    def __init__(self, hbase, fieldCount, fieldLength, maxScanLength, rng):
+        self.hbase = hbase
+        self.fields = [f'field{i}' for i in range(fieldCount)]
+        self.fieldLength = fieldLength
+        self.maxScanLength = maxScanLength
+        self.rng = rng
+
+    def value(self):
+        return ''.join(self.rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=self.fieldLength))
+
+    def insert(self, rowId):
+        for field in self.fields:
+            self.hbase.putRow(TABLE, rowId, f'{FAMILY}:{field}', self.value())
+
+    def read(self, rowId):
+        return self.hbase.get(TABLE, rowId).cells
+
+    def update(self, rowId):
+        self.hbase.putRow(TABLE, rowId, f'{FAMILY}:{self.rng.choice(self.fields)}', self.value())
+
+    def scan(self, rowId):
+        return sum(1 for _ in self.hbase.scan(TABLE, startRow=rowId, rowLimit=self.rng.randint(1, self.maxScanLength)))
+
+    def readmodifywrite(self, rowId):
+        self.read(rowId)
+        self.update(rowId)
+
+def runWorkload(workload, recordCount=1000, operationCount=1000, fieldCount=10, fieldLength=100,
+                maxScanLength=100, distribution=None, seed=42, properties=None, keepData=False):
+    config = {'workload': workload, 'description': WORKLOADS[workload]['description'], 'recordcount': recordCount,
+              'operationcount': operationCount, 'fieldcount': fieldCount, 'fieldlength': fieldLength,
+              'maxscanlength': maxScanLength, 'distribution': distribution or WORKLOADS[workload]['distribution'],
+              'seed': seed, 'properties': properties or {}}
+    rng = random.Random(seed)
+    keys = keyGenerator(config['distribution'], seed)
+    operations = proportions(workload)
+
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp(prefix=f'ycsb_{workload}_')
+    os.chdir(directory)
+    try:
+        hbase = HBase(**config['properties'])
+        hbase.createTable(TABLE, [FAMILY])
+        client = Client(hbase, fieldCount, fieldLength, maxScanLength, rng)
+
+        load = Measurements()
+        inicio = perf_counter()
+        for keynum in range(recordCount):
+            load.measure('insert', client.insert, recordKey(keynum))
+        loadElapsed = perf_counter() - inicio
+
+        run = Measurements()
+        inserted = recordCount
+        names = [operation for operation, _ in operations]
+        weights = [weight for _, weight in operations]
+        inicio = perf_counter()
+        for _ in range(operationCount):
+            operation = rng.choices(names, weights)[0]
+            if operation == 'insert':
+                rowId = recordKey(inserted)
+                inserted += 1
+            else:
+                rowId = recordKey(keys.next(inserted))
+            run.measure(operation, getattr(client, operation), rowId)
+        runElapsed = perf_counter() - inicio
+    finally:
+        os.chdir(cwd)
+        if not keepData:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return {'config': config, 'load': load.summary(loadElapsed), 'run': run.summary(runElapsed)}
+
+def gitRevision():
+    try:
+        root = os.path.dirname(os.path.abspath(sys.modules['hbase'].__file__))
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def environment():
+    return {'date': datetime.now().isoformat(timespec='seconds'), 'timestamp': time(), 'revision': gitRevision(),
+            'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()}
@@ -0,0 +1,17 @@
+# Cargas de trabajo de YCSB: proporción de cada operación y distribución de las claves pedidas.
+# Los scans leen entre 1 y maxScanLength filas (distribución uniforme) desde una clave elegida
+# con la distribución de la carga.
+
+WORKLOADS = {
+    'a': {'description': 'update heavy', 'read': 0.5, 'update': 0.5, 'distribution': 'zipfian'},
+    'b': {'description': 'read mostly', 'read': 0.95, 'update': 0.05, 'distribution': 'zipfian'},
+    'c': {'description': 'read only', 'read': 1.0, 'distribution': 'zipfian'},
+    'd': {'description': 'read latest', 'read': 0.95, 'insert': 0.05, 'distribution': 'latest'},
+    'e': {'description': 'short ranges', 'scan': 0.95, 'insert': 0.05, 'distribution': 'zipfian'},
+    'f': {'description': 'read-modify-write', 'read': 0.5, 'readmodifywrite': 0.5, 'distribution': 'zipfian'},
+}
+
+OPERATIONS = ['read', 'update', 'insert', 'scan', 'readmodifywrite']
+
+def proportions(workload):
+    return [(operation, WORKLOADS[workload][operation]) for operation in OPERATIONS if WORKLOADS[workload].get(operation)]
@@ -0,0 +1,40 @@
+import math
+import base64
+import hashlib
+
+class BloomFilter:
+    def __init__(self, bits, hashes, data=None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray(data) if data is not None else bytearray((bits + 7) // 8)
+
+    @classmethod
+    def forCapacity(cls, keys, errorRate):
+        keys = max(keys, 1)
+        bits = max(64, int(math.ceil(-keys * math.log(errorRate) / (math.log(2) ** 2))))
+        hashes = max(1, round(bits / keys * math.log(2)))
+        return cls(bits, hashes)
+
+    @classmethod
+    def fromJSON(cls, info):
+        return cls(info['bits'], info['hashes'], base64.b64decode(info['data']))
+
+    def toJSON(self):
+        return {'bits': self.bits, 'hashes': self.hashes, 'data': base64.b64encode(bytes(self.data)).decode('ascii')}
+
+    def positions(self, key):
+        # Double hashing (Kirsch-Mitzenmacher): k posiciones a partir de dos hashes de 64 bits
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, key):
+        for p in self.positions(key):
+            self.data[p >> 3] |= 1 << (p & 7)
+
+    def mightContain(self, key):
+        return all(self.data[p >> 3] & (1 << (p & 7)) for p in self.positions(key))
+
+def rowColumnKey(rowId, cf, column):
+    return f'{rowId}/{cf}:{column}'
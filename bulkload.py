@@ -0,0 +1,105 @@
+import os
+import csv
+import json
+import heapq
+import tempfile
+from keyvalue import cellKey, PUT
+from memstore import CELL_OVERHEAD
+
+# Carga masiva: cada registro de un CSV (con encabezado) o de un archivo JSON lines se
+# convierte en celdas, que se ordenan en tramos del tamaño del buffer. Los tramos que no
+# caben en memoria se vuelcan a archivos temporales y luego se combinan con un merge de
+# k vías, de modo que el archivo de entrada puede ser más grande que la memoria.
+
+ROW_KEY = 'HBASE_ROW_KEY'
+
+def parseMapping(text):
+    # 'id=HBASE_ROW_KEY,nombre=info:nombre'; sin '=' el campo se llama igual que el destino
+    mapping = {}
+    for entry in text.split(','):
+        entry = entry.strip().strip('\'"')
+        if not entry:
+            continue
+        field, _, target = entry.partition('=')
+        mapping[field.strip()] = (target or field).strip()
+    return mapping
+
+def readRecords(path):
+    # Los errores de formato se lanzan como ValueError, que bulkLoad informa al usuario
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            reader = csv.DictReader(f)
+            try:
+                yield from reader
+            except csv.Error as e:
+                raise ValueError(f'CSV inválido: {e}') from e
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f'la línea {number} no es un objeto JSON')
+                yield record
+
+def recordCells(records, mapping, timestamp):
+    rowField = next(field for field, target in mapping.items() if target == ROW_KEY)
+    columns = [(field, *target.split(':', 1)) for field, target in mapping.items() if target != ROW_KEY]
+    for record in records:
+        rowId = record.get(rowField)
+        if rowId is None or rowId == '':
+            continue
+        for field, cf, column in columns:
+            value = record.get(field)
+            if value is None:
+                continue
+            yield (str(rowId), cf, column, timestamp, PUT, value if isinstance(value, str) else json.dumps(value))
+
+def cellSize(cell):
+    return len(cell[0]) + len(cell[1]) + len(cell[2]) + len(cell[3]) + len(cell[5]) + CELL_OVERHEAD
+
+def sortKey(item):
+    # Las celdas se ordenan primero por familia para escribir los HFiles de cada store de
+    # forma consecutiva. Ante celdas repetidas gana la última del archivo de entrada
+    seq, cell = item
+    return cell[1], cellKey(cell), -seq
+
+def spill(items, tmpDir):
+    with tempfile.NamedTemporaryFile('w', dir=tmpDir, suffix='.run', delete=False, encoding='utf-8') as f:
+        for seq, cell in items:
+            f.write(json.dumps([seq, *cell]) + '\n')
+    return f.name
+
+def readRun(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            seq, *cell = json.loads(line)
+            yield seq, tuple(cell)
+
+def externalSort(cells, bufferSize, tmpDir):
+    runs = []
+    readers = []
+    buffer = []
+    size = 0
+    try:
+        for item in enumerate(cells):
+            buffer.append(item)
+            size += cellSize(item[1])
+            if size >= bufferSize:
+                buffer.sort(key=sortKey)
+                runs.append(spill(buffer, tmpDir))
+                buffer, size = [], 0
+        buffer.sort(key=sortKey)
+
+        readers = [readRun(run) for run in runs]
+        last = None
+        for _, cell in heapq.merge(iter(buffer), *readers, key=sortKey):
+            if cell[:5] == last:
+                continue
+            last = cell[:5]
+            yield cell
+    finally:
+        for reader in readers:
+            reader.close()
+        for run in runs:
+            os.remove(run)
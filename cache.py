@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+class BlockCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.keysByPath = {}
+        self.residentBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Los lectores en paralelo comparten el cache
+        self.lock = threading.RLock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            if size > self.capacity:
+                return
+            if key in self.entries:
+                self.remove(key)
+
+            self.entries[key] = (value, size)
+            self.keysByPath.setdefault(key[0], set()).add(key)
+            self.residentBytes += size
+
+            while self.residentBytes > self.capacity:
+                oldest = next(iter(self.entries))
+                self.remove(oldest)
+                self.evictions += 1
+
+    def remove(self, key):
+        _, size = self.entries.pop(key)
+        self.residentBytes -= size
+        keys = self.keysByPath.get(key[0])
+        keys.discard(key)
+        if not keys:
+            del self.keysByPath[key[0]]
+
+    def invalidate(self, path):
+        with self.lock:
+            for key in list(self.keysByPath.get(path, ())):
+                self.remove(key)
+
+    def hitRatio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
@@ -0,0 +1,88 @@
+import os
+import json
+import copy
+import threading
+from wal import WAL
+from durable import atomicWrite
+
+# Catálogo de namespaces y tablas. Se mantiene en memoria como namespace -> tabla -> atributos,
+# por lo que buscar una tabla es O(1). Solo se persisten las tablas marcadas como modificadas:
+# cada commit agrega una línea al journal (metadata.journal) con el estado completo de esas
+# tablas, y cada checkpointInterval cambios se escribe metadata.json completo (de forma
+# atómica) y se vacía el journal. Al abrir el catálogo se lee metadata.json y se aplica el journal.
+#
+# Cada commit guarda además una copia de las tablas confirmadas (saved): el checkpoint escribe
+# esas copias y no los atributos en memoria, que otro hilo puede estar modificando con el lock
+# de su tabla. lock serializa los commits y los cambios de namespaces y de la lista de tablas.
+
+class Catalog:
+    def __init__(self, path='metadata.json', checkpointInterval=1000):
+        self.path = path
+        self.journal = WAL(os.path.splitext(path)[0] + '.journal')
+        self.checkpointInterval = checkpointInterval
+        self.namespaces = {}
+        self.saved = {}
+        self.dirty = set()
+        self.journaled = 0
+        self.lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.namespaces = json.load(f)
+        for entry in self.journal.replay():
+            for change in entry['changes']:
+                self.apply(change)
+                self.journaled += 1
+        self.saved = copy.deepcopy(self.namespaces)
+
+    def apply(self, change, namespaces=None):
+        namespaces = self.namespaces if namespaces is None else namespaces
+        namespace, name, value = change['namespace'], change['table'], change['value']
+        if name is None:
+            if value is None:
+                namespaces.pop(namespace, None)
+            else:
+                namespaces.setdefault(namespace, {})
+        elif value is None:
+            namespaces.get(namespace, {}).pop(name, None)
+        else:
+            namespaces.setdefault(namespace, {})[name] = value
+
+    def table(self, namespace, name):
+        return self.namespaces.get(namespace, {}).get(name)
+
+    def markDirty(self, namespace, name=None):
+        # name=None indica que cambió el namespace (creado o eliminado)
+        with self.lock:
+            self.dirty.add((namespace, name))
+
+    def commit(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            changes = []
+            for namespace, name in sorted(self.dirty, key=lambda k: (k[0], k[1] is not None, k[1] or '')):
+                if name is None:
+                    value = {} if namespace in self.namespaces else None
+                else:
+                    value = copy.deepcopy(self.table(namespace, name))
+                changes.append({'namespace': namespace, 'table': name, 'value': value})
+            # Todos los cambios de un commit van en una sola línea: o se aplican todos o ninguno
+            self.journal.append({'changes': changes})
+            for change in changes:
+                self.apply(change, self.saved)
+            self.journaled += len(changes)
+            self.dirty.clear()
+
+            if self.journaled >= self.checkpointInterval:
+                self.checkpoint()
+
+    def checkpoint(self):
+        with self.lock:
+            namespaces = {ns: {k: tables[k] for k in sorted(tables)} for ns, tables in self.saved.items()}
+            with atomicWrite(self.path) as f:
+                json.dump(namespaces, f, indent=4)
+            self.journal.reset()
+            self.journaled = 0
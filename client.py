@@ -0,0 +1,68 @@
+import re
+import socket
+from protocol import HEADER, MAX_FRAME, encodeFrame, decodeFrame
+
+# Cliente del servidor TCP (ver server.py y protocol.py). execute envía un comando y espera su respuesta;
+# pipeline envía varios comandos sin esperar cada respuesta y devuelve las respuestas en orden.
+#
+#   with HBaseClient('127.0.0.1', 16000) as client:
+#       print(client.execute("put usuarios 1 info_personal:nombre Ana", plain=True))
+
+ANSI = re.compile(r'\033\[\d+m')
+
+class HBaseError(Exception):
+    pass
+
+class HBaseClient:
+    def __init__(self, host='127.0.0.1', port=16000, timeout=None):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile('rb')
+        self.nextId = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def send(self, command):
+        self.nextId += 1
+        self.sock.sendall(encodeFrame({'id': self.nextId, 'command': command}))
+        return self.nextId
+
+    def receive(self, plain=False):
+        header = self.file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ConnectionError('El servidor cerró la conexión')
+        size, = HEADER.unpack(header)
+        if size > MAX_FRAME:
+            raise HBaseError(f'Respuesta de {size} bytes supera el máximo de {MAX_FRAME}')
+        response = decodeFrame(self.file.read(size))
+        if 'error' in response:
+            raise HBaseError(response['error'])
+        result = response['result']
+        # plain=True quita los colores ANSI del resultado
+        return ANSI.sub('', result) if plain and isinstance(result, str) else result
+
+    def execute(self, command, plain=False):
+        self.send(command)
+        return self.receive(plain)
+
+    def pipeline(self, commands, plain=False, window=32):
+        # Como mucho window peticiones en vuelo, para que ni el cliente ni el servidor queden
+        # bloqueados escribiendo mientras el otro no lee
+        results = []
+        inFlight = 0
+        for command in commands:
+            if inFlight == window:
+                results.append(self.receive(plain))
+                inFlight -= 1
+            self.send(command)
+            inFlight += 1
+        results += [self.receive(plain) for _ in range(inFlight)]
+        return results
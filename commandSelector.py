@@ -1,4 +1,65 @@
 import re
+from time import perf_counter
+from metrics import tableKey
+from results import HBaseError
+from renderer import renderGet, renderScan, renderCount, renderError, renderExplain
+
+def parseOptions(text):
+    options = {}
+    for key, value in re.findall(r"(\w+)\s*=>\s*(\[[^\]]*\]|'[^']*'|\"[^\"]*\"|[^,}\s]+)", text):
+        if value.startswith('['):
+            options[key.upper()] = [v.strip().strip('\'"') for v in value[1:-1].split(',') if v.strip()]
+        else:
+            options[key.upper()] = value.strip('\'"')
+    return options
+
+TABLE_COMMANDS = {'create', 'disable', 'enable', 'is_enabled', 'alter', 'drop', 'describe', 'put', 'get', 'scan', 'bulk_load',
+                  'delete', 'deleteall', 'count', 'truncate', 'convert', 'compact', 'major_compact', 'explain'}
+
+def getQuery(hbase, parts, explain=False):
+    # Devuelve el resultado y los argumentos con los que se formatea
+    families = parts[3:] if len(parts) > 3 else None
+    timestamp = None
+    timestampREGEX = r'^[0-9]+\.[0-9]+$'
+    if families and re.match(timestampREGEX,families[-1]):
+        timestamp = families[-1]
+        families.remove(timestamp)
+    return hbase.get(parts[1], parts[2], families, timestamp, explain), (), {}
+
+def scanQuery(hbase, parts, explain=False):
+    options = parseOptions(parts[-1]) if parts[-1].startswith('{') else {}
+    positional = [p for p in parts[2:] if not p.startswith('{')]
+    limit = int(positional[0]) if len(positional) > 0 else None
+    offset = int(positional[1]) if len(positional) > 1 else None
+    rowLimit = int(options['LIMIT']) if 'LIMIT' in options else None
+    columns = options.get('COLUMNS')
+    if isinstance(columns, str):
+        columns = [columns]
+    result = hbase.scan(parts[1], options.get('STARTROW'), options.get('STOPROW'), columns, rowLimit, explain)
+    return result, (limit, offset), {'preview': limit is None and rowLimit is None}
+
+QUERIES = {'get': (getQuery, renderGet), 'scan': (scanQuery, renderScan)}
+
+def explain(hbase, parts):
+    # Ejecuta el get o scan, formatea el resultado (sin mostrarlo) e informa el plan y su costo
+    query = parts[0].lower()
+    if query not in QUERIES:
+        return "\033[91mERROR: explain solo admite los comandos get y scan\033[0m"
+    queryFunction, renderFunction = QUERIES[query]
+    inicio = perf_counter()
+    result, args, kwargs = queryFunction(hbase, parts, explain=True)
+    renderStart = perf_counter()
+    renderFunction(result, *args, **kwargs)
+    renderSeconds = perf_counter() - renderStart - result.io.get('read_seconds', 0)
+    return renderExplain(query, result, max(renderSeconds, 0), perf_counter() - inicio)
+
+def render(hbase, command, table, function, result, *args, **kwargs):
+    # Mide el tiempo de formato; en un scan se descuenta el tiempo de lectura de las celdas
+    inicio = perf_counter()
+    text = function(result, *args, **kwargs)
+    elapsed = perf_counter() - inicio - (result.io.get('read_seconds', 0) if hasattr(result, 'io') else 0)
+    hbase.metrics.observe(f'render.{command}', tableKey(table), max(elapsed, 0))
+    return text
 
 def commandSelector(hbase,command):    
     if '{' in command:
@@ -16,60 +77,77 @@ def commandSelector(hbase,command):
     
     command = parts[0].lower()
 
+    # Latencia de cada comando de punta a punta (incluido el formato), por tabla
+    tableArg = 2 if command == 'explain' else 1
+    table = tableKey(parts[tableArg]) if command in TABLE_COMMANDS and len(parts) > tableArg else ''
     try:
-        if command == 'create_namespace':
-            return hbase.createNamespace(parts[1])
-        elif command == 'list_namespaces':
-            return hbase.listNamespaces()
-        elif command == 'create':
-            return hbase.createTable(parts[1],parts[2:])
-        elif command == 'list':
-            param = parts[1] if len(parts) > 1 else None
-            return hbase.listTables(param)
-        elif command == 'disable':
-            return hbase.disableTable(parts[1])
-        elif command == 'enable':
-            return hbase.enableTable(parts[1])
-        elif command == 'is_enabled':
-            return hbase.checkEnabledTable(parts[1])
-        elif command == 'alter':
-            return hbase.alterTable(parts[1], ' '.join(parts[2:]))
-        elif command == 'drop':
-            return hbase.dropTable(parts[1])
-        elif command == 'drop_all':
-            param = parts[1] if len(parts) > 1 else None
-            return hbase.dropAllTables(param)
-        elif command == 'describe':
-            return hbase.describeTable(parts[1])
-        elif command == 'put':
-            value = ' '.join(parts[4:])
-            return hbase.putRow(parts[1], parts[2], parts[3], value)
-        elif command == 'get':
-            families = parts[3:] if len(parts) > 3 else None
-            timestamp = None
-            timestampREGEX = r'^[0-9]+\.[0-9]+$'
-            if families and re.match(timestampREGEX,families[-1]):
-                timestamp = families[-1]
-                families.remove(timestamp)
-            return hbase.getData(parts[1], parts[2], families, timestamp)
-        elif command == 'scan':
-            limit = int(parts[2]) if len(parts) > 2 else None
-            offset = int(parts[3]) if len(parts) > 3 else None
-            return hbase.scanData(parts[1], limit, offset)
-        elif command == 'delete':
-            return hbase.deleteRow(parts[1], parts[2], parts[3], parts[4])
-        elif command == 'deleteall':
-            return hbase.deleteAll(parts[1], parts[2])
-        elif command == 'count':
-            return hbase.countRows(parts[1])
-        elif command == 'truncate':
-            return hbase.truncateTable(parts[1])
-        elif command == 'help':
-            instruction = parts[1] if len(parts) > 1 else None
-            return hbase.getHelp(instruction)
-        else:
-            return hbase.getHelp(command)
-        
+        with hbase.metrics.timer(f'command.{command}', table):
+            return runCommand(hbase, command, parts)
+    except HBaseError as e:
+        return renderError(e)
     except Exception as e:
         print(e)
-        return f"\033[91mError: Parámetros insuficientes\033[0m"
\ No newline at end of file
+        return f"\033[91mError: Parámetros insuficientes\033[0m"
+
+def runCommand(hbase, command, parts):
+    if command == 'create_namespace':
+        return hbase.createNamespace(parts[1])
+    elif command == 'list_namespaces':
+        return hbase.listNamespaces()
+    elif command == 'create':
+        return hbase.createTable(parts[1],parts[2:])
+    elif command == 'list':
+        param = parts[1] if len(parts) > 1 else None
+        return hbase.listTables(param)
+    elif command == 'disable':
+        return hbase.disableTable(parts[1])
+    elif command == 'enable':
+        return hbase.enableTable(parts[1])
+    elif command == 'is_enabled':
+        return hbase.checkEnabledTable(parts[1])
+    elif command == 'alter':
+        return hbase.alterTable(parts[1], ' '.join(parts[2:]))
+    elif command == 'drop':
+        return hbase.dropTable(parts[1])
+    elif command == 'drop_all':
+        param = parts[1] if len(parts) > 1 else None
+        return hbase.dropAllTables(param)
+    elif command == 'describe':
+        return hbase.describeTable(parts[1])
+    elif command == 'put':
+        value = ' '.join(parts[4:])
+        return hbase.putRow(parts[1], parts[2], parts[3], value)
+    elif command in QUERIES:
+        queryFunction, renderFunction = QUERIES[command]
+        result, args, kwargs = queryFunction(hbase, parts)
+        return render(hbase, command, parts[1], renderFunction, result, *args, **kwargs)
+    elif command == 'explain':
+        return explain(hbase, parts[1:])
+    elif command == 'bulk_load':
+        return hbase.bulkLoad(parts[1], parts[2], ','.join(parts[3:]))
+    elif command == 'delete':
+        return hbase.deleteRow(parts[1], parts[2], parts[3], parts[4] if len(parts) > 4 else None)
+    elif command == 'deleteall':
+        return hbase.deleteAll(parts[1], parts[2])
+    elif command == 'count':
+        options = parseOptions(parts[-1]) if parts[-1].startswith('{') else {}
+        return render(hbase, command, parts[1], renderCount, hbase.count(parts[1], exact=str(options.get('EXACT', '')).lower() == 'true'))
+    elif command == 'truncate':
+        return hbase.truncateTable(parts[1])
+    elif command == 'migrate':
+        return hbase.migrateTables(parts[1] if len(parts) > 1 else None)
+    elif command == 'convert':
+        return hbase.convertTable(parts[1])
+    elif command == 'status':
+        return hbase.getStatus()
+    elif command == 'metrics':
+        return hbase.getMetrics(parts[1] if len(parts) > 1 else None)
+    elif command == 'help':
+        instruction = parts[1] if len(parts) > 1 else None
+        return hbase.getHelp(instruction)
+    elif command == 'compact':
+        return hbase.compactTable(parts[1])
+    elif command == 'major_compact':
+        return hbase.compactTable(parts[1], major=True)
+    else:
+        return hbase.getHelp(command)
\ No newline at end of file
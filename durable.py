@@ -0,0 +1,34 @@
+import os
+from contextlib import contextmanager
+
+# Escrituras durables de archivos completos (HFiles, metadata.json, métricas). Nunca se escribe
+# sobre el archivo final: se escribe un temporal, se hace fsync, se reemplaza el destino con
+# os.replace (atómico) y se hace fsync del directorio para que el reemplazo también llegue al
+# disco. Una caída deja el archivo anterior o el nuevo completo, nunca uno a medias; como mucho
+# queda un .tmp, que la siguiente escritura reemplaza. Los logs (WAL y journal) se escriben
+# agregando líneas con wal.WAL.
+
+def fsyncDir(path):
+    fd = os.open(path or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Algunos sistemas de archivos no permiten fsync de directorios
+        pass
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomicWrite(path, mode='w'):
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    fsyncDir(os.path.dirname(path))
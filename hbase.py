@@ -1,6 +1,5 @@
 import os
-import json
-from time import time
+from time import time, sleep, perf_counter
 import glob
 import shutil
 import re
@@ -8,59 +7,620 @@ from datetime import datetime
 import shutil
 from tabulate import tabulate
 import textwrap
+import threading
+import tempfile
+from bisect import bisect_right
+from memstore import TableMemStore
+from keyvalue import rowKey, cellKey, cellsToRows, PUT, DELETE, DELETE_COLUMN, DELETE_FAMILY
+from hfile import openHFile, scanHFile, writeHFile, newIO, convertHFile, stripEnabledFlag, fileStats, hfileIndex, storeOf, ROWCOL
+from bloom import rowColumnKey
+from cache import BlockCache
+from itertools import chain, groupby, islice
+from scanner import mergeCells, rowRange, renameFamilies, applyTombstones, limitVersions, projectColumns, limitRows, overlaps
+from wal import WAL, DURABILITY_LEVELS
+from durable import fsyncDir
+from catalog import Catalog
+from parallel import ParallelReader
+from metrics import MetricsRegistry, tableKey, timed
+from mvcc import RWLock, MVCC, snapshotCells, locked
+from results import Cell, GetResult, ScanResult, HBaseError, NamespaceNotFoundException, TableNotFoundException, TableDisabledException, FamilyNotFoundException
+from bulkload import parseMapping, readRecords, recordCells, externalSort, ROW_KEY
+
+def timedCells(cells, io, key):
+    # Acumula en io[key] el tiempo que tarda cells en producir cada celda
+    cells = iter(cells)
+    io[key] = io.get(key, 0)
+    while True:
+        inicio = perf_counter()
+        cell = next(cells, None)
+        io[key] += perf_counter() - inicio
+        if cell is None:
+            return
+        yield cell
 
 class HBase:
-    def __init__(self):
+    MAX_VERSIONS = 3
+
+    def __init__(self, memstoreFlushSize=64 * 1024, regionMaxSize=256 * 1024, bloomFilter='ROW', bloomErrorRate=0.01, blockCacheSize=32 * 1024 * 1024,
+                 compactionThreshold=3, compactionInterval=None, bulkLoadBufferSize=16 * 1024 * 1024, catalogCheckpointInterval=1000,
+                 readWorkers=1, readExecutor='thread', metricsDumpPath=None, metricsDumpInterval=60, walDurability='batch', walSyncInterval=1.0):
         self.metadata_file = 'metadata.json'
-        self.metadata = {}
-        self.readMetadata()
+        self.memstoreFlushSize = memstoreFlushSize
+        self.regionMaxSize = regionMaxSize
+        self.bloomFilter = bloomFilter
+        self.bloomErrorRate = bloomErrorRate
+        self.memstores = {}
+        self.wals = {}
+        self.regionStarts = {}
+        # Cuándo se hace fsync del WAL: 'op', 'batch' (group commit) o 'async' (ver wal.py)
+        if walDurability not in DURABILITY_LEVELS:
+            raise ValueError(f"Durabilidad '{walDurability}' no válida: use 'op', 'batch' o 'async'")
+        self.walDurability = walDurability
+        self.blooms = {}
+        self.blockCache = BlockCache(blockCacheSize)
+        self.reader = ParallelReader(readWorkers, readExecutor, self.blockCache)
+        self.compactionThreshold = compactionThreshold
+        self.bulkLoadBufferSize = bulkLoadBufferSize
+        self.readStats = {'gets': 0, 'files_read': 0, 'bytes_read': 0}
+        # Cada tabla tiene su propio lock y su MVCC (ver mvcc.py); self.lock solo protege la
+        # creación de las estructuras por tabla
+        self.lock = threading.RLock()
+        self.tableLocks = {}
+        self.mvccs = {}
+        self.bloomStats = {'checks': 0, 'skipped': 0, 'false_positives': 0}
+        self.metrics = MetricsRegistry()
+        self.catalog = Catalog(self.metadata_file, catalogCheckpointInterval)
+        self.metadata = self.catalog.namespaces
 
         if 'default' not in self.metadata:
             self.createNamespace('default')
-            self.writeMetadata()
 
-    def verifyTable(self,name):
+        self.replayWALs()
+
+        if metricsDumpPath:
+            threading.Thread(target=self.metrics.dumpLoop, args=(metricsDumpPath, metricsDumpInterval), daemon=True).start()
+
+        if compactionInterval:
+            threading.Thread(target=self.compactionLoop, args=(compactionInterval,), daemon=True).start()
+
+        if walDurability == 'async':
+            threading.Thread(target=self.walSyncLoop, args=(walSyncInterval,), daemon=True).start()
+
+    def findTable(self, name):
+        # Devuelve (namespace, tabla) si la tabla no existe o (namespace, tabla, familias, habilitada, región)
         if ':' in name:
             current_namespace, name = name.split(':')
         else: current_namespace = 'default'
 
         if current_namespace == '':
-            return '\033[91mERROR: Debe especificar el namespace.\033[0m'
+            raise HBaseError('Debe especificar el namespace.')
         
         if name == '':
-            return '\033[91mERROR: Debe especificar el nombre de la tabla.\033[0m'
+            raise HBaseError('Debe especificar el nombre de la tabla.')
 
         if current_namespace not in self.metadata:
-            return '\033[91mNamespaceNotFoundException: El namespace especificado no existe.\033[0m'
+            raise NamespaceNotFoundException('El namespace especificado no existe.')
         
-        tables = [(namespace,t,atributes['families'],atributes['enabled'],atributes['region']) for namespace,tables in self.metadata.items() for t,atributes in tables.items() if namespace == current_namespace and t == name]
-        return tables[0] if len(tables) > 0 else (current_namespace,name)
+        atributes = self.catalog.table(current_namespace, name)
+        if atributes is None:
+            return (current_namespace,name)
+        return (current_namespace,name,atributes['families'],atributes['enabled'],atributes['region'])
 
-    def readMetadata(self):
-        if os.path.exists(self.metadata_file):
-            with open(self.metadata_file, 'r') as f:
-                self.metadata = json.load(f)
+    def verifyTable(self,name):
+        try:
+            return self.findTable(name)
+        except HBaseError as e:
+            return f'\033[91m{e.label}: {e}\033[0m'
+
+    def openTable(self, name, columns=None, enabled=True):
+        # Para la API de lectura: los errores se lanzan como excepciones en lugar de devolverse como texto
+        table = self.findTable(name)
+        if len(table) == 2:
+            raise TableNotFoundException(f"La tabla '{table[1]}' no existe en el namespace '{table[0]}'")
+        if enabled and not table[3]:
+            raise TableDisabledException(f"La tabla '{table[1]}' está deshabilitada.")
+        for col in columns or []:
+            if col.split(':')[0] not in table[2]:
+                raise FamilyNotFoundException(f"La familia '{col.split(':')[0]}' no existe en la tabla '{table[1]}'")
+        return table
+
+    def writeMetadata(self, *tables):
+        # tables: pares (namespace, tabla) modificados; (namespace, None) si cambió el namespace
+        with self.catalog.lock:
+            for namespace, name in tables:
+                atributes = self.catalog.table(namespace, name) if name is not None else None
+                if atributes is not None and 'hfile_stats' in atributes:
+                    self.aggregateStats(atributes)
+                self.catalog.markDirty(namespace, name)
+            self.catalog.commit()
+
+    def tablePath(self, namespace, name):
+        return os.path.join(f'namespaces/{namespace}', name)
+
+    def getRegions(self, namespace, name):
+        atributes = self.metadata[namespace][name]
+        if 'regions' not in atributes:
+            with self.catalog.lock:
+                if 'regions' not in atributes:
+                    files = glob.glob(os.path.join(self.tablePath(namespace, name), 'HFile_*'))
+                    # Los .tmp son escrituras que no terminaron (ver durable.atomicWrite)
+                    files = sorted([os.path.basename(f) for f in files if not f.endswith('.tmp')], key=hfileIndex)
+                    atributes['regions'] = [{'id': 0, 'start_key': None, 'end_key': None, 'files': files}]
+                    self.writeMetadata((namespace, name))
+        return atributes['regions']
+
+    def regionFor(self, namespace, name, rowId):
+        # Las claves de inicio codificadas se guardan mientras no cambie la lista de regiones: un
+        # split la modifica en el lugar y siempre agrega una región, y crear o truncar la tabla la reemplaza
+        regions = self.getRegions(namespace, name)
+        cached = self.regionStarts.get((namespace, name))
+        if cached is None or cached[0] is not regions or cached[1] != len(regions):
+            cached = (regions, len(regions), [rowKey(r['start_key']) for r in regions[1:]])
+            self.regionStarts[(namespace, name)] = cached
+        return regions[bisect_right(cached[2], rowKey(rowId))]
+
+    def hfilePaths(self, namespace, name, regions=None, families=None):
+        # families: nombres físicos de las familias a leer; los HFiles de la raíz de la tabla
+        # (anteriores a los stores por familia) contienen todas las familias y siempre se incluyen
+        regions = self.getRegions(namespace, name) if regions is None else regions
+        return [os.path.join(self.tablePath(namespace, name), f) for r in regions for f in r['files']
+                if families is None or storeOf(f) == '' or storeOf(f) in families]
+
+    def nextHFileName(self, namespace, name):
+        atributes = self.metadata[namespace][name]
+        if 'next_hfile' not in atributes:
+            files = [f for r in self.getRegions(namespace, name) for f in r['files']]
+            atributes['next_hfile'] = max([hfileIndex(f) for f in files], default=-1) + 1
+        index = atributes['next_hfile']
+        atributes['next_hfile'] += 1
+        return f'HFile_{index}.hfile'
+
+    def hfileMetadata(self, table, region):
+        families = self.familyMap(table)
+        return {
+            'table_name': table[1],
+            'column_families': [families[cf] for cf in table[2]],
+            'creation_time': datetime.now().isoformat(),
+            'region': region['id']
+        }
 
-    def writeMetadata(self):
-        for namespace in self.metadata:
-            self.metadata[namespace] = {k: self.metadata[namespace][k] for k in sorted(self.metadata[namespace])}
-            
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=4)
+    def writeHFile(self, table, region, cells, store=''):
+        # Cada column family tiene su propio directorio (store) dentro de la tabla
+        fileName = self.nextHFileName(table[0], table[1])
+        if store:
+            os.makedirs(os.path.join(self.tablePath(table[0], table[1]), store), exist_ok=True)
+            fileName = f'{store}/{fileName}'
+        metadata = self.hfileMetadata(table, region)
+
+        path = os.path.join(self.tablePath(table[0], table[1]), fileName)
+        stats = writeHFile(path, metadata, cells, self.bloomFilter, self.bloomErrorRate)
+        self.metrics.increment('write.hfiles', tableKey(table))
+        self.metrics.increment('write.hfile_bytes', tableKey(table), os.path.getsize(path))
+        region['files'].append(fileName)
+        self.metadata[table[0]][table[1]].setdefault('hfile_stats', {})[fileName] = stats
+        return fileName
+
+    def writeStores(self, table, region, cells):
+        # Escribe un HFile por column family; los tombstones de fila (familia '') van a la raíz
+        stores = {}
+        for cell in cells:
+            stores.setdefault(cell[1], []).append(cell)
+        return [self.writeHFile(table, region, storeCells, store) for store, storeCells in stores.items()]
+
+    def removeHFile(self, table, fileName):
+        # Si hay scans abiertos sobre la tabla el HFile se borra cuando termina el último
+        path = os.path.join(self.tablePath(table[0], table[1]), fileName)
+        if not self.getMVCC(table).retire([path]):
+            return
+        self.deleteHFiles([path])
+        if storeOf(fileName) and not os.listdir(os.path.dirname(path)):
+            os.rmdir(os.path.dirname(path))
+
+    def deleteHFiles(self, paths):
+        for path in paths:
+            self.forgetHFile(path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # La tabla se eliminó mientras un scan la recorría
+                pass
+
+    def aggregateStats(self, atributes):
+        # Descarta las estadísticas de HFiles que ya no pertenecen a ninguna región y suma el resto
+        files = {f for r in atributes.get('regions', []) for f in r['files']}
+        known = atributes['hfile_stats']
+        for fileName in [f for f in known if f not in files]:
+            known.pop(fileName)
+
+        stats = {'files': len(known), 'cells': 0, 'rows': 0, 'bytes': 0, 'puts': 0, 'deletes': 0}
+        for fileStat in known.values():
+            for key in ('cells', 'rows', 'bytes', 'puts', 'deletes'):
+                stats[key] += fileStat[key]
+        atributes['stats'] = stats
+        return stats
+
+    def tableStats(self, table):
+        # count solo toma el lock de lectura de la tabla, así que las estadísticas se completan con el del catálogo
+        with self.catalog.lock:
+            atributes = self.metadata[table[0]][table[1]]
+            known = atributes.setdefault('hfile_stats', {})
+            missing = [f for r in self.getRegions(table[0], table[1]) for f in r['files'] if 'families' not in known.get(f, {})]
+            for fileName in missing:
+                known[fileName] = fileStats(os.path.join(self.tablePath(table[0], table[1]), fileName), self.blockCache)
+            if missing:
+                self.writeMetadata((table[0], table[1]))
+            return self.aggregateStats(atributes)
+
+    def getMemStore(self, namespace, name):
+        with self.lock:
+            if (namespace, name) not in self.memstores:
+                self.memstores[(namespace, name)] = TableMemStore()
+            return self.memstores[(namespace, name)]
+
+    def getWAL(self, namespace, name):
+        with self.lock:
+            if (namespace, name) not in self.wals:
+                onSync = lambda seconds: self.metrics.observe('wal_sync', f'{namespace}:{name}', seconds)
+                self.wals[(namespace, name)] = WAL(os.path.join(self.tablePath(namespace, name), 'WAL.log'), self.walDurability, onSync)
+            return self.wals[(namespace, name)]
+
+    def tableLock(self, table):
+        # table: nombre o tupla; el lock existe aunque la tabla no, para que crearla también se serialice.
+        # Solo se toma self.lock la primera vez
+        key = tableKey(table)
+        lock = self.tableLocks.get(key)
+        if lock is None:
+            with self.lock:
+                lock = self.tableLocks.setdefault(key, RWLock())
+        return lock
+
+    def getMVCC(self, table):
+        key = tableKey(table)
+        mvcc = self.mvccs.get(key)
+        if mvcc is None:
+            with self.lock:
+                mvcc = self.mvccs.setdefault(key, MVCC(self.deleteHFiles))
+        return mvcc
+
+    def replayWALs(self):
+        for namespace, tables in self.metadata.items():
+            for name in tables:
+                memstore = self.getMemStore(namespace, name)
+                for entry in self.getWAL(namespace, name).replay():
+                    memstore.apply(entry['row'], entry['cf'], entry['column'], entry['timestamp'], entry.get('type', PUT), entry['value'])
+
+    @timed('flush')
+    @locked('write')
+    def flushMemStore(self, table):
+        memstore = self.memstores.get((table[0], table[1]))
+        if memstore is None or memstore.isEmpty():
+            return 0
+
+        batches = {}
+        for cell in memstore.cells():
+            region = self.regionFor(table[0], table[1], cell[0])
+            batches.setdefault(region['id'], (region, []))[1].append(cell)
+
+        for region, cells in batches.values():
+            self.writeStores(table, region, cells)
+        self.writeMetadata((table[0], table[1]))
+
+        cells = len(memstore)
+        self.metrics.increment('flush.cells', tableKey(table), cells)
+        # Los scans abiertos conservan la MemStore anterior junto con la lista de HFiles que no incluye los nuevos
+        self.memstores[(table[0], table[1])] = TableMemStore()
+        self.getWAL(table[0], table[1]).reset()
+
+        for region, _ in batches.values():
+            self.splitRegion(table, region)
+        return cells
+
+    def flushIfFull(self, table):
+        # Se comprueba primero sin lock: la mayoría de las escrituras no necesitan flush
+        memstore = self.memstores.get(tuple(tableKey(table).split(':')))
+        if memstore is None or memstore.size < self.memstoreFlushSize:
+            return
+        with self.tableLock(table).write():
+            table = self.findTable(tableKey(table))
+            memstore = self.memstores.get((table[0], table[1]))
+            if len(table) > 2 and memstore is not None and memstore.size >= self.memstoreFlushSize:
+                self.flushMemStore(table)
+
+    def flushAll(self):
+        # Vuelca todas las MemStores (por ejemplo al terminar un batch con el flush diferido)
+        cells = 0
+        for namespace, name in list(self.memstores):
+            table = self.verifyTable(f'{namespace}:{name}')
+            if isinstance(table, tuple) and len(table) > 2:
+                cells += self.flushMemStore(table)
+        return cells
+
+    @timed('split_check')
+    @locked('write')
+    def splitRegion(self, table, region):
+        paths = self.hfilePaths(table[0], table[1], [region])
+        if sum(os.path.getsize(p) for p in paths) < self.regionMaxSize:
+            return False
+
+        cells = list(mergeCells([scanHFile(p, self.blockCache) for p in reversed(paths)]))
+        keys = list(dict.fromkeys(c[0] for c in cells))
+        if len(keys) < 2:
+            return False
+
+        splitKey = keys[len(keys) // 2]
+        regions = self.getRegions(table[0], table[1])
+        nextId = max(r['id'] for r in regions) + 1
+        daughters = [
+            {'id': nextId, 'start_key': region['start_key'], 'end_key': splitKey, 'files': []},
+            {'id': nextId + 1, 'start_key': splitKey, 'end_key': region['end_key'], 'files': []}
+        ]
+        self.writeStores(table, daughters[0], [c for c in cells if rowKey(c[0]) < rowKey(splitKey)])
+        self.writeStores(table, daughters[1], [c for c in cells if rowKey(c[0]) >= rowKey(splitKey)])
+
+        self.metrics.increment('region.splits', tableKey(table))
+        index = regions.index(region)
+        regions[index:index + 1] = daughters
+        self.writeMetadata((table[0], table[1]))
+
+        for fileName in region['files']:
+            self.removeHFile(table, fileName)
+        return True
+
+    def getBloom(self, path):
+        if path not in self.blooms:
+            with openHFile(path, self.blockCache) as reader:
+                self.blooms[path] = (reader.bloom, reader.bloomType)
+        return self.blooms[path]
+
+    def mightContain(self, path, rowId, columns=None):
+        bloom, bloomType = self.getBloom(path)
+        if bloom is None:
+            return True
+
+        self.bloomStats['checks'] += 1
+        if bloomType == ROWCOL and columns:
+            keys = [rowColumnKey(rowId, '', '')]
+            for cf, column in columns:
+                keys += [rowColumnKey(rowId, cf, ''), rowColumnKey(rowId, cf, column)]
+            found = any(bloom.mightContain(key) for key in keys)
+        else:
+            found = bloom.mightContain(rowId)
+
+        if not found:
+            self.bloomStats['skipped'] += 1
+        return found
+
+    def forgetHFile(self, path):
+        self.blooms.pop(path, None)
+        self.blockCache.invalidate(path)
+
+    def dropMemStore(self, namespace, name):
+        self.memstores.pop((namespace, name), None)
+        self.regionStarts.pop((namespace, name), None)
+        wal = self.wals.pop((namespace, name), None)
+        if wal is not None:
+            wal.close()
+
+    def discoverHFiles(self, table, region, stores=None, io=None):
+        # HFiles de la región que necesita una lectura, del más reciente al más antiguo
+        inicio = perf_counter()
+        paths = list(reversed(self.hfilePaths(table[0], table[1], [region], stores)))
+        if io is not None:
+            io['discovery_seconds'] += perf_counter() - inicio
+            if 'plan' in io:
+                for fileName in region['files']:
+                    path = os.path.join(self.tablePath(table[0], table[1]), fileName)
+                    if path not in paths:
+                        self.planStep(io, table, region, path, 'skipped (store)')
+        return paths
+
+    def planStep(self, io, table, region, path, action, cells=None):
+        # Con explain, io['plan'] registra qué se hizo con cada HFile (o la MemStore)
+        if io is None or 'plan' not in io:
+            return
+        if region is None:
+            io['plan'].append({'region': '-', 'file': path, 'bytes': None, 'action': action, 'cells': cells})
+            return
+        io['plan'].append({'region': region['id'], 'file': os.path.relpath(path, self.tablePath(table[0], table[1])),
+                           'bytes': os.path.getsize(path), 'action': action, 'cells': cells})
+
+    def regionCells(self, table, region, paths, startRow=None, io=None):
+        for path in paths:
+            self.planStep(io, table, region, path, 'scan')
+        yield from mergeCells([scanHFile(p, self.blockCache, startRow, io) for p in paths])
+
+    def storesFor(self, table, columns):
+        # Nombres físicos de las familias que necesita una proyección ('cf' o 'cf:columna')
+        if not columns:
+            return None
+        families = self.familyMap(table)
+        return {families[c.split(':')[0]] for c in columns if c.split(':')[0] in families}
+
+    def scanCells(self, table, startRow=None, stopRow=None, columns=None, rowLimit=None, io=None):
+        # Se llama con el lock de lectura de la tabla. Los HFiles y la MemStore se eligen ahora y la
+        # snapshot los mantiene mientras se recorren las celdas, que ya no necesitan el lock
+        snapshot = self.getMVCC(table).snapshot()
+        stores = self.storesFor(table, columns)
+        inicio = perf_counter()
+        regions = []
+        for region in self.getRegions(table[0], table[1]):
+            if overlaps(region, startRow, stopRow):
+                regions.append(region)
+            else:
+                for path in self.hfilePaths(table[0], table[1], [region]):
+                    self.planStep(io, table, region, path, 'skipped (range)')
+        if io is not None:
+            io['discovery_seconds'] += perf_counter() - inicio
+
+        sources = [(region, self.discoverHFiles(table, region, stores, io)) for region in regions]
+        if self.reader.workers > 1:
+            # Los HFiles se decodifican en paralelo y cada región se combina en orden
+            cells = self.reader.regionCells([paths for _, paths in sources], startRow, stopRow, io)
+        else:
+            cells = chain.from_iterable(self.regionCells(table, region, paths, startRow, io) for region, paths in sources)
+
+        memstore = self.memstores.get((table[0], table[1]))
+        if memstore is not None and not memstore.isEmpty():
+            self.planStep(io, table, None, 'MemStore', 'scan', len(memstore))
+            cells = mergeCells([memstore.cells(startRow, stores, snapshot.readPoint), cells])
+
+        if io is not None and 'plan' in io:
+            # Con explain se mide cuánto tarda en llegar cada celda de la MemStore y los HFiles,
+            # para separar la lectura del filtrado
+            cells = timedCells(cells, io, 'source_seconds')
+        cells = rowRange(cells, startRow, stopRow)
+        cells = renameFamilies(cells, self.storedFamilies(table))
+        cells = applyTombstones(cells)
+        cells = limitVersions(cells, self.familyVersions(table))
+        cells = projectColumns(cells, columns)
+        return snapshotCells(limitRows(cells, rowLimit), snapshot)
+
+    def readRow(self, table, rowId, columns=None, families=None, io=None, readPoint=None):
+        # columns: pares (familia, columna); families: familias completas a leer. Sin ninguno
+        # de los dos se leen todos los stores. readPoint: ver mvcc.py (None lee todas las celdas)
+        sources = []
+        self.readStats['gets'] += 1
+        familyMap = self.familyMap(table)
+        stored = [(familyMap.get(cf, cf), column) for cf, column in columns] if columns else None
+        if stored:
+            stores = {cf for cf, _ in stored}
+        else:
+            stores = self.storesFor(table, families)
+
+        memstore = self.memstores.get((table[0], table[1]))
+        if memstore is not None:
+            sources.append(memstore.rowCells(rowId, stores, readPoint))
+            self.planStep(io, table, None, 'MemStore', 'read', len(sources[-1]))
+
+        inicio = perf_counter()
+        region = self.regionFor(table[0], table[1], rowId)
+        if io is not None:
+            io['discovery_seconds'] += perf_counter() - inicio
+        for file_path in self.discoverHFiles(table, region, stores, io):
+            if not self.mightContain(file_path, rowId, stored):
+                self.planStep(io, table, region, file_path, 'skipped (bloom)')
+                continue
+            with openHFile(file_path, self.blockCache, io) as reader:
+                cells = reader.getRowCells(rowId)
+            self.readStats['files_read'] += 1
+            if not cells:
+                self.bloomStats['false_positives'] += 1
+            self.planStep(io, table, region, file_path, 'read', len(cells))
+            sources.append(cells)
+
+        inicio = perf_counter()
+        cells = renameFamilies(mergeCells(sources), self.storedFamilies(table))
+        cells = applyTombstones(cells)
+        cells = limitVersions(cells, self.familyVersions(table))
+        row = cellsToRows(cells).get(rowId, {})
+        if io is not None:
+            io['filter_seconds'] += perf_counter() - inicio
+        return row
+
+    def familyMap(self, table):
+        atributes = self.metadata[table[0]][table[1]]
+        return atributes.get('family_map') or {family: family for family in table[2]}
+
+    def storedFamilies(self, table):
+        return {physical: logical for logical, physical in self.familyMap(table).items()}
+
+    def familyVersions(self, table):
+        versions = self.metadata[table[0]][table[1]].get('versions', {})
+        return {cf: versions.get(cf, self.MAX_VERSIONS) for cf in table[2]}
+
+    @timed('compaction')
+    @locked('write')
+    def compactRegion(self, table, region, major=False):
+        # La compactación menor une los HFiles de cada store por separado, conserva los tombstones
+        # y los nombres físicos de las familias. La mayor une todos los stores de la región,
+        # elimina los datos borrados y reescribe las celdas con el esquema actual
+        if major:
+            groups = [list(region['files'])] if region['files'] else []
+        else:
+            stores = {}
+            for fileName in region['files']:
+                stores.setdefault(storeOf(fileName), []).append(fileName)
+            groups = [files for files in stores.values() if len(files) >= 2]
+
+        compacted = []
+        for files in groups:
+            paths = [os.path.join(self.tablePath(table[0], table[1]), f) for f in files]
+            cells = mergeCells([scanHFile(p, self.blockCache) for p in reversed(paths)])
+            if major:
+                cells = sorted(renameFamilies(cells, self.storedFamilies(table)), key=cellKey)
+                cells = applyTombstones(cells)
+                cells = list(limitVersions(cells, self.familyVersions(table)))
+            else:
+                families = self.familyMap(table)
+                cells = applyTombstones(cells, keepDeletes=True)
+                cells = list(limitVersions(cells, {families.get(cf, cf): v for cf, v in self.familyVersions(table).items()}))
+
+            region['files'] = [f for f in region['files'] if f not in files]
+            self.writeStores(table, region, cells)
+            compacted += files
+
+        if compacted:
+            self.metrics.increment('compaction.major' if major else 'compaction.minor', tableKey(table))
+            self.metrics.increment('compaction.files', tableKey(table), len(compacted))
+            self.writeMetadata((table[0], table[1]))
+        for fileName in compacted:
+            self.removeHFile(table, fileName)
+        return len(compacted)
+
+    def compactionLoop(self, interval):
+        # Toma el mismo lock de escritura de la tabla que el flush, los splits y el comando
+        # compact, así que no se mezcla con los get, put, delete ni con otro flush de la tabla;
+        # los scans ya abiertos conservan sus HFiles hasta terminar (ver mvcc.py)
+        while True:
+            sleep(interval)
+            for namespace, name in self.tableNames():
+                # Un error en una tabla (por ejemplo si se elimina mientras se compacta) no detiene el compactador
+                try:
+                    with self.tableLock((namespace, name)).write():
+                        table = self.findTable(f'{namespace}:{name}')
+                        if len(table) == 2:
+                            continue
+                        for region in list(self.getRegions(namespace, name)):
+                            stores = [storeOf(f) for f in region['files']]
+                            if any(stores.count(store) >= self.compactionThreshold for store in set(stores)):
+                                self.compactRegion(table, region)
+                except Exception as e:
+                    print(f'No se pudo compactar {namespace}:{name}: {e}')
+
+    def syncWALs(self):
+        # Hace fsync de las escrituras pendientes de todos los WAL (solo las hay con walDurability='async')
+        with self.lock:
+            wals = list(self.wals.values())
+        for wal in wals:
+            wal.sync()
+
+    def walSyncLoop(self, interval):
+        while True:
+            sleep(interval)
+            try:
+                self.syncWALs()
+            except OSError as e:
+                print(f'No se pudieron sincronizar los WAL: {e}')
+
+    def tableNames(self):
+        # (namespace, tabla) de todas las tablas, copiados para recorrerlos mientras otros hilos crean o eliminan tablas
+        with self.catalog.lock:
+            return [(namespace, name) for namespace, tables in self.metadata.items() for name in tables]
 
     def createNamespace(self, name):
         inicio = time()
-        if name in self.metadata:
-            return f"\033[91mNamespaceExistsException: El namespace '{name}' ya existe\033[0m"
-                
-        self.metadata[name] = {}
+        with self.catalog.lock:
+            if name in self.metadata:
+                return f"\033[91mNamespaceExistsException: El namespace '{name}' ya existe\033[0m"
 
-        self.writeMetadata()
+            self.metadata[name] = {}
+            self.writeMetadata((name, None))
 
         namespace_path = os.path.join('namespaces', name)
         os.makedirs(namespace_path, exist_ok=True)
         return f'\033[95m0 \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'            
 
+    @locked('write')
     def createTable(self, name, columnFamilies, embedded = False):
         inicio = time()
         result = ''
@@ -86,8 +646,10 @@ class HBase:
         if name in tables:
             return f"\033[91mTableExistsException: La tabla '{name}' ya existe dentro del namespace {current_namespace}\033[0m" if not embedded else False
         
-        tables[name] = {'families': columnFamilies, 'enabled':True, 'region': len(self.metadata[current_namespace])}
-        self.writeMetadata()
+        with self.catalog.lock:
+            tables[name] = {'families': columnFamilies, 'enabled':True, 'region': len(self.metadata[current_namespace]),
+                            'regions': [{'id': 0, 'start_key': None, 'end_key': None, 'files': []}]}
+            self.writeMetadata((current_namespace, name))
 
         table_path = os.path.join(f'namespaces/{current_namespace}', name)
         os.makedirs(table_path, exist_ok=True)
@@ -120,9 +682,14 @@ class HBase:
             if regex[-1] != '$':
                 regex = f'{regex}$'
 
+        # Se copia la lista con el lock del catálogo: otro hilo (por ejemplo una conexión del
+        # servidor) puede estar creando o eliminando tablas
+        with self.catalog.lock:
+            names = sorted(self.metadata.get(current_namespace, {}))
+
         result = 'TABLE\n'
         rows = 0
-        for table in self.metadata[current_namespace]:
+        for table in names:
             if not re.match(regex,table): continue
             result += f'{table}\n'
             rows += 1
@@ -134,12 +701,15 @@ class HBase:
         result = ''
         result += 'NAMESPACE\n'
         rows = 0
-        for namespace in self.metadata.keys():
+        with self.catalog.lock:
+            namespaces = list(self.metadata)
+        for namespace in namespaces:
             result += f'{namespace}\n'
             rows += 1
         result += f'\033[95m{rows} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
         return result
 
+    @locked('write')
     def disableTable(self, name, embedded=False):
         inicio = time()
         table = self.verifyTable(name)
@@ -150,24 +720,13 @@ class HBase:
         if len(table) == 2:
             return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m" if not embedded else False
 
+        self.flushMemStore(table)
+        # El estado de la tabla solo vive en el catálogo: deshabilitarla no toca los HFiles
         self.metadata[table[0]][table[1]]["enabled"] = False
-        self.writeMetadata()
-
-        path = os.path.join(f'namespaces/{table[0]}/', table[1])
-        files = [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
-
-        for file in files:
-            full_path = os.path.join(path, file)
-            file_content = {}
-            with open(full_path, 'r') as f:
-                file_content = json.load(f)
-
-            if file_content['metadata']['enabled']:
-                file_content['metadata']['enabled'] = False
-            with open(full_path, 'w') as f:
-                json.dump(file_content, f, indent=4)
+        self.writeMetadata((table[0], table[1]))
         return f'\033[95m0 \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds' if not embedded else True
     
+    @locked('write')
     def enableTable(self, name):
         inicio = time()
         table = self.verifyTable(name)
@@ -179,23 +738,10 @@ class HBase:
             return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m"
 
         self.metadata[table[0]][table[1]]["enabled"] = True
-        self.writeMetadata()
-
-        path = os.path.join(f'namespaces/{table[0]}/', table[1])
-        files = [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
-
-        for file in files:
-            full_path = os.path.join(path, file)
-            file_content = {}
-            with open(full_path, 'r') as f:
-                file_content = json.load(f)
-
-            if not file_content['metadata']['enabled']:
-                file_content['metadata']['enabled'] = True
-            with open(full_path, 'w') as f:
-                json.dump(file_content, f, indent=4)
+        self.writeMetadata((table[0], table[1]))
         return f'\033[95m0 \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
     
+    @locked('read')
     def checkEnabledTable(self, name):
         result = ''
         inicio = time()
@@ -216,6 +762,7 @@ class HBase:
         result += f'\033[95m0 \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
         return result
 
+    @locked('write')
     def alterTable(self, name, options):
         result = ''
         table = self.verifyTable(name)
@@ -230,6 +777,7 @@ class HBase:
             return f"\033[91mTableNotDisabledException: La tabla '{table[1]}' no está deshabilitada.\033[0m"
 
         inicio = time()
+        self.flushMemStore(table)
 
         options = options[1:-1]
         
@@ -237,62 +785,61 @@ class HBase:
         actions = {}
         for oc in option_commands:
             instructions = [i.strip() for i in oc.split('=>')]
-            actions[instructions[0]] = instructions[1]
+            actions[instructions[0]] = instructions[1].strip('\'"')
 
         cf = actions.get('NAME')
         action = actions.get('METHOD') if 'METHOD' in actions.keys() else 'add'
+        atributes = self.metadata[table[0]][table[1]]
+        versions = atributes.setdefault('versions', {})
+        # Nombre lógico -> nombre físico de cada familia (el que se guarda en los HFiles)
+        families = atributes.setdefault('family_map', {family: family for family in table[2]})
 
         if action == 'add':
             if cf not in table[2]:
                 table[2].append(cf)
+            if 'VERSIONS' in actions.keys():
+                versions[cf] = int(actions['VERSIONS'])
         if action == 'delete':
             if cf in table[2]:
                 table[2].remove(cf)        
+            versions.pop(cf, None)
+        newCF = actions.get('NEW') if 'NEW' in actions.keys() else cf
         if action == 'modify':
-            newCF = actions.get('NEW') if 'NEW' in actions.keys() else cf
             if cf in table[2]:
                 table[2].remove(cf)
                 table[2].append(newCF)
-
-
-        self.writeMetadata()
-        result += 'Updating all files with the new schema...\n'
-
-        path = os.path.join(f'namespaces/{table[0]}/', table[1])
-        files = [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
-
-        for file in files:
-            full_path = os.path.join(path, file)
-            file_content = {}
-            with open(full_path, 'r') as f:
-                file_content = json.load(f)
-
-            if action == 'add' and cf not in file_content['metadata']['column_families']:
-                file_content['metadata']['column_families'].append(cf)
-            if action == 'delete' and cf in file_content['metadata']['column_families']:
-                file_content['metadata']['column_families'].remove(cf)
-                data = file_content['data']
-
-                for _,v in data.items():
-                    if cf in v:
-                        v.pop(cf)
-            if action == 'modify' and cf in file_content['metadata']['column_families']:
-                newCF = actions.get('NEW') if 'NEW' in actions.keys() else cf
-                file_content['metadata']['column_families'].append(newCF)
-                file_content['metadata']['column_families'].remove(cf)
-                data = file_content['data']
-
-                for _,v in data.items():
-                    if cf in v:
-                        v[newCF] = v[cf]
-                        v.pop(cf)
-            with open(full_path, 'w') as f:
-                json.dump(file_content, f, indent=4)
-
-
-        result += f'\033[95m{len(files)} \033[96mfiles\033[0m(s) updated in \033[95m{round(time() - inicio,6)} \033[0mseconds\nDone'
+                if cf in versions:
+                    versions[newCF] = versions.pop(cf)
+            if 'VERSIONS' in actions.keys():
+                versions[newCF] = int(actions['VERSIONS'])
+
+        # El cambio solo se registra en el catálogo; los HFiles conservan los nombres físicos de
+        # las familias y la compactación mayor reescribe los datos con el esquema actual
+        version = atributes.get('schema_version', 0) + 1
+
+        if action == 'add' and cf not in families:
+            used = set(families.values()) | set(atributes.get('dropped_families', []))
+            families[cf] = cf if cf not in used else f'{cf}~{version}'
+        if action == 'delete' and cf in families:
+            atributes.setdefault('dropped_families', []).append(families.pop(cf))
+        if action == 'modify' and cf in families:
+            families[newCF] = families.pop(cf)
+
+        atributes['schema_version'] = version
+        atributes.setdefault('schema_history', []).append({
+            'version': version,
+            'method': action,
+            'family': cf,
+            'new': newCF if action == 'modify' else None,
+            'time': datetime.now().isoformat()
+        })
+        self.writeMetadata((table[0], table[1]))
+
+        result += f'Updating table schema to version {version}...\n'
+        result += f'\033[95m0 \033[96mfiles\033[0m(s) updated in \033[95m{round(time() - inicio,6)} \033[0mseconds\nDone'
         return result
 
+    @locked('write')
     def dropTable(self,name,embedded = False):
         inicio = time()
         table = self.verifyTable(name)
@@ -306,8 +853,13 @@ class HBase:
         if table[3]:
             return f"\033[91mTableNotDisabledException: La tabla '{table[1]}' no está deshabilitada.\033[0m" if not embedded else False
         
-        self.metadata[table[0]].pop(table[1])
-        self.writeMetadata()
+        for file_path in self.hfilePaths(table[0], table[1]):
+            self.forgetHFile(file_path)
+
+        with self.catalog.lock:
+            self.metadata[table[0]].pop(table[1])
+            self.writeMetadata((table[0], table[1]))
+        self.dropMemStore(table[0], table[1])
 
         table_path = os.path.join(f'namespaces/{table[0]}', table[1])
         files = len(glob.glob(os.path.join(table_path, "*")))
@@ -339,7 +891,8 @@ class HBase:
             if regex[-1] != '$':
                 regex = f'{regex}$'
         
-        tables = [t for t in self.metadata[current_namespace].keys() if re.match(regex, t)]
+        with self.catalog.lock:
+            tables = [t for t in self.metadata.get(current_namespace, {}) if re.match(regex, t)]
         
         counter = 0
         for t in tables:
@@ -359,6 +912,7 @@ class HBase:
         result += f'\033[95m{counter} \033[96mtable\033[0m(s) dropped in \033[95m{round(time() - inicio,6)} \033[0mseconds'
         return result
 
+    @locked('read')
     def describeTable(self,name):
         inicio = time()
         result = ''
@@ -374,97 +928,103 @@ class HBase:
         result += f'{table[1]}\n'
         result += '\033[95mCOLUMN FAMILIES DESCRIPTION\033[0m\n'
 
+        versions = self.familyVersions(table)
         for cf in table[2]:
-            result += f"{'{'}NAME => \033[92m'{cf}'\033[0m{'}'}\n"
+            result += f"{'{'}NAME => \033[92m'{cf}'\033[0m, VERSIONS => \033[92m'{versions[cf]}'\033[0m{'}'}\n"
 
         result += f'\033[95m{len(table[2])} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
         return result
 
-    def putRow(self,table,rowId,col,value):
+    @locked('write')
+    def convertTable(self, name):
         inicio = time()
-        table = self.verifyTable(table)
+        table = self.verifyTable(name)
 
         if not isinstance(table,tuple):
             return table
 
         if len(table) == 2:
             return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m"
-        
-        if not table[3]:
-            return f"\033[91mTableDisabledException: La tabla '{table[1]}' está deshabilitada.\033[0m"
-        
-        if ':' not in col:
-            return f"\033[91mERROR: Debe especificar el column family al que pertenece la columna\033[0m"
-        
-        cf, column = col.split(':')
 
-        if cf not in table[2]:
-            return f"\033[91mFamilyNotFoundException: La familia '{cf}' no existe en la tabla '{table[1]}'\033[0m"
-        
-        table_path = os.path.join(f'namespaces/{table[0]}', table[1])
-        files = len(glob.glob(os.path.join(table_path, "*")))
-        files = files - 1 if files > 0 else files
+        # Los HFiles JSON se borran después de registrar los nuevos en el catálogo, como en las
+        # compactaciones; si la conversión falla a medias se registran los que ya se convirtieron
+        converted = []
+        tablePath = self.tablePath(table[0], table[1])
+        try:
+            for region in self.getRegions(table[0], table[1]):
+                for i, fileName in enumerate(region['files']):
+                    if fileName.endswith('.json'):
+                        newPath = convertHFile(os.path.join(tablePath, fileName), self.bloomFilter, self.bloomErrorRate)
+                        region['files'][i] = os.path.relpath(newPath, tablePath)
+                        converted.append(fileName)
+        finally:
+            self.writeMetadata((table[0], table[1]))
+        for fileName in converted:
+            self.removeHFile(table, fileName)
+        files = len(converted)
+
+        return f'\033[95m{files} \033[96mfile\033[0m(s) converted in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+
+    def migrateTables(self, name=None):
+        # Migración: elimina de los HFiles JSON el flag 'enabled', que ahora solo guarda el catálogo
+        inicio = time()
+        if name:
+            table = self.verifyTable(name)
 
-        fileName = f'HFile_{files}.json'
-        hfile = {}
-        
-        file_path = os.path.join(table_path, fileName)
+            if not isinstance(table,tuple):
+                return table
 
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                hfile = json.load(f)
-                
-        # if 'data' in hfile.keys() and len(hfile['data']) > 50:
-        #     fileName = f'HFile_{files+1}.json'
-        #     file_path = os.path.join(table_path, fileName)
-        #     hfile['data'] = {}
-        #     hfile['metadata']['creation_time'] = datetime.now().isoformat()
-
-        if 'metadata' not in hfile.keys():
-            hfile['metadata'] = {
-                'table_name': table[1],
-                'enabled': True,
-                'column_families': table[2],
-                'creation_time': datetime.now().isoformat(),
-                'region': table[4]
-                }
-            
-        timestamp = datetime.now().timestamp()
-        
-        if 'data' not in hfile.keys():
-            hfile['data'] = {rowId: {cf: {column: {timestamp: value}}}}
+            if len(table) == 2:
+                return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m"
+            tables = [table[:2]]
         else:
-            if rowId in hfile['data'].keys():
-                if cf in hfile['data'][rowId]:
-                    if column in hfile['data'][rowId][cf]:
-                        values = list(hfile['data'][rowId][cf][column].values())
-                        if len(values) and value != values[0]:
-                            hfile['data'][rowId][cf][column] = {timestamp: value, **hfile['data'][rowId][cf][column]}
-                    else:
-                        hfile['data'][rowId][cf][column] = {timestamp: value}
-                else:
-                    hfile['data'][rowId][cf] = {column: {timestamp: value}}
-            else:
-                hfile['data'][rowId] = {cf: {column: {timestamp: value}}}
-            
-        if len(hfile['data'][rowId][cf][column]) == 4:
-            hfile['data'][rowId][cf][column].popitem()
-            
-        hfile['data'] = {k: hfile['data'][k] for k in sorted(hfile['data'], key=int)}
+            tables = self.tableNames()
 
-        with open(file_path, 'w') as f:
-            json.dump(hfile, f, indent=2)
-            
-        return f'\033[95m{1} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
-    
-    
-    def getData(self, table, rowId, cols=None, timestamp=None):
-        resultMessage=''
+        files = 0
+        for namespace, t in tables:
+            with self.tableLock((namespace, t)).write():
+                for path in self.hfilePaths(namespace, t):
+                    if path.endswith('.json') and stripEnabledFlag(path):
+                        self.forgetHFile(path)
+                        files += 1
+
+        return f'\033[95m{files} \033[96mfile\033[0m(s) migrated in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+
+    @locked('write')
+    def compactTable(self, name, major=False):
+        inicio = time()
+        table = self.verifyTable(name)
+
+        if not isinstance(table,tuple):
+            return table
+
+        if len(table) == 2:
+            return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m"
+
+        self.flushMemStore(table)
+        regions = self.getRegions(table[0], table[1])
+        before = len(self.hfilePaths(table[0], table[1]))
+        compacted = sum(self.compactRegion(table, region, major) for region in regions)
+        after = len(self.hfilePaths(table[0], table[1]))
+
+        atributes = self.metadata[table[0]][table[1]]
+        if major and 'family_map' in atributes:
+            # Todas las regiones quedaron escritas con los nombres lógicos
+            atributes['family_map'] = {family: family for family in table[2]}
+            atributes['dropped_families'] = []
+            self.writeMetadata((table[0], table[1]))
+
+        result = f'{"Major" if major else "Minor"} compaction of {table[0]}:{table[1]}\n'
+        result += f'   - HFiles: {before} -> {after}\n'
+        result += f'   - HFiles per region: {round(before / len(regions), 2)} -> {round(after / len(regions), 2)}\n'
+        result += f'\033[95m{compacted} \033[96mfile\033[0m(s) compacted in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+        return result
+
+    @timed('put')
+    @locked('read', flush=True)
+    def putRow(self,table,rowId,col,value):
         inicio = time()
         table = self.verifyTable(table)
-        result = {}
-        cf = None
-        column = None
 
         if not isinstance(table,tuple):
             return table
@@ -475,75 +1035,36 @@ class HBase:
         if not table[3]:
             return f"\033[91mTableDisabledException: La tabla '{table[1]}' está deshabilitada.\033[0m"
         
-        if cols:
-            for col in cols:
-                if ':' not in col: cf = col
-                else: cf, column = col.split(':')
+        if ':' not in col:
+            return f"\033[91mERROR: Debe especificar el column family al que pertenece la columna\033[0m"
+        
+        cf, column = col.split(':')
 
-                if cf not in table[2]:
-                    return f"\033[91mFamilyNotFoundException: La familia '{cf}' no existe en la tabla '{table[1]}'\033[0m"
-                if ':' in col:
-                    result[(cf,column)] = []
-            
-        rows = []
+        if cf not in table[2]:
+            return f"\033[91mFamilyNotFoundException: La familia '{cf}' no existe en la tabla '{table[1]}'\033[0m"
         
-        table_path = os.path.join(f'namespaces/{table[0]}', table[1])
-        files = glob.glob(os.path.join(table_path, "*"))
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    hfile = json.load(f)
-                    if 'data' in hfile.keys():
-                        rows.append(hfile['data'])
-                        
-        rowCounter = 0
-        
-        for r in rows:
-            if rowId in r.keys():
-                if not cols:
-                    result = {
-                        (family, column): {}
-                        for _, families in r.items()
-                        for family, columns in families.items()
-                        for column in columns.keys()
-                    }
-                if cf and not column:
-                    result = {
-                        (family, column): {}
-                        for _, families in r.items()
-                        for family, columns in families.items()
-                        for column in columns.keys()
-                        if family == cf
-                    }
-                for c in result.keys():
-                    if c[1] in r[rowId][c[0]].keys():
-                        result[c] = r[rowId][c[0]][c[1]]
-                        if timestamp:
-                            result[c] = {k: v for k, v in result[c].items() if k == timestamp}
-                    else:
-                        result[c] = {}
-                continue
+        memstore = self.getMemStore(table[0], table[1])
+        cf = self.familyMap(table)[cf]
+
+        # El timestamp se toma dentro de la escritura para que siga el orden de seq
+        wal = self.getWAL(table[0], table[1])
+        with self.getMVCC(table).write(wal) as seq:
+            if memstore.latest(rowId, cf, column) == value:
+                return f'\033[95m{1} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+
+            timestamp = str(datetime.now().timestamp())
+            written = wal.append({'row': rowId, 'cf': cf, 'column': column, 'timestamp': timestamp, 'type': PUT, 'value': value})
+            memstore.put(rowId, cf, column, timestamp, value, seq)
+        self.metrics.increment('write.wal_bytes', tableKey(table), written)
+
+        return f'\033[95m{1} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
     
-        headers = ['\033[94mCOLUMN','\033[95mCELL\033[0m']
-        
-        data = []
-        for r in result.items():
-            for v in r[1].items():
-                data.append([f'{r[0][0]}:{r[0][1]}',f'value={v[1]} timestamp={v[0]}'])
-                rowCounter += 1
-                
-        resultMessage += tabulate(data, headers=headers, tablefmt="plain")
-        resultMessage += '\n'
-        resultMessage += f'\n\033[95m{rowCounter} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
-        return resultMessage
     
-    def scanData(self, table, limit, offset):
-        offset = 0 if offset is None else max(offset - 1, 0)
-        limit = 10 if limit is not None and limit <= 0 else limit
-        resultMessage=''
+    @timed('bulk_load')
+    @locked('write')
+    def bulkLoad(self, name, filePath, mapping):
         inicio = time()
-        table = self.verifyTable(table)
-        result = {}
+        table = self.verifyTable(name)
 
         if not isinstance(table,tuple):
             return table
@@ -553,55 +1074,137 @@ class HBase:
         
         if not table[3]:
             return f"\033[91mTableDisabledException: La tabla '{table[1]}' está deshabilitada.\033[0m"
-            
-        rows = []
-        
-        table_path = os.path.join(f'namespaces/{table[0]}', table[1])
-        files = glob.glob(os.path.join(table_path, "*"))
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    hfile = json.load(f)
-                    if 'data' in hfile.keys():
-                        rows.append(hfile['data'])
-                        
-        rowCounter = 0
-        headers = ['\033[95mROW','\033[94mCOLUMN\033[0m+CELL']
-        data = []
         
-        for r in rows:
-            for rowId, families in r.items():
-                for family, columns in families.items():
-                    for column, info in columns.items():
-                        result[(rowId,f'{family}:{column}')] = info
-                        rowCounter += len(info)
-    
-        
-        for r in result.items():
-            for v in r[1].items():
-                data.append([r[0][0],f'\033[94mcolumn\033[0m={r[0][1]} \033[95mtimestamp\033[0m=\033[95m{v[0]} \033[94mvalue\033[0m={v[1]}'])                
-                
-        if limit is None and len(data) and len(data) > 10:
-            data = data[offset:10+offset]
-            data.append(['.', '.'])
-            data.append(['.', '.'])
-            data.append(['.', '.'])
-        elif len(data) and limit:
-            data = data[offset:limit+offset]
-            
-        resultMessage += tabulate(data, headers=headers, tablefmt="plain")
-        resultMessage += '\n'
-        if limit is None and len(data) and len(data) > 10:
-            limit = 10
-            resultMessage += f'\n\033[93mWARNING:\033[0m {rowCounter - limit - offset} row(s) more'
-        elif not len(data): limit = 0
-        else: limit = 10
-            
-        resultMessage += f'\n\033[95m{min(limit, len(data))} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
-        return resultMessage
+        if not os.path.isfile(filePath):
+            return f"\033[91mERROR: El archivo '{filePath}' no existe\033[0m"
         
+        mapping = parseMapping(mapping)
+        if list(mapping.values()).count(ROW_KEY) != 1:
+            return f"\033[91mERROR: El mapeo debe indicar exactamente un campo {ROW_KEY}\033[0m"
         
-    def deleteRow(self, name, rowId, column, timestamp):
+        for target in mapping.values():
+            if target == ROW_KEY:
+                continue
+            if ':' not in target:
+                return f"\033[91mERROR: Debe especificar el column family al que pertenece la columna\033[0m"
+            if target.split(':')[0] not in table[2]:
+                return f"\033[91mFamilyNotFoundException: La familia '{target.split(':')[0]}' no existe en la tabla '{table[1]}'\033[0m"
+
+        families = self.familyMap(table)
+        mapping = {f: t if t == ROW_KEY else f"{families[t.split(':')[0]]}:{t.split(':', 1)[1]}" for f, t in mapping.items()}
+
+        # Los HFiles se escriben primero en un directorio temporal y solo se añaden a las regiones
+        # cuando todos están completos, con una única escritura del catálogo
+        timestamp = str(datetime.now().timestamp())
+        tablePath = self.tablePath(table[0], table[1])
+        staging = tempfile.mkdtemp(prefix='.bulkload_', dir=tablePath)
+        regions = {r['id']: r for r in self.getRegions(table[0], table[1])}
+        loaded = []
+        cells = 0
+        # El directorio temporal se borra siempre, también si la carga falla a medias
+        try:
+            try:
+                cellStream = externalSort(recordCells(readRecords(filePath), mapping, timestamp), self.bulkLoadBufferSize, staging)
+                # Las celdas llegan agrupadas por familia, así que cada grupo es un HFile de un store
+                for (store, regionId), group in groupby(cellStream, key=lambda c: (c[1], self.regionFor(table[0], table[1], c[0])['id'])):
+                    path = os.path.join(staging, f'{store}_{regionId}.hfile')
+                    stats = writeHFile(path, self.hfileMetadata(table, regions[regionId]), group, self.bloomFilter, self.bloomErrorRate)
+                    cells += stats['cells']
+                    loaded.append((regions[regionId], store, path, stats))
+            except (ValueError, KeyError) as e:
+                return f"\033[91mERROR: No se pudo leer el archivo '{filePath}': {e}\033[0m"
+
+            # Los HFiles ya están en disco (writeHFile hace fsync); antes de registrarlos en el catálogo
+            # también tienen que estarlo los directorios a los que se mueven
+            known = self.metadata[table[0]][table[1]].setdefault('hfile_stats', {})
+            for region, store, path, stats in loaded:
+                fileName = f'{store}/{self.nextHFileName(table[0], table[1])}'
+                os.makedirs(os.path.join(tablePath, store), exist_ok=True)
+                os.replace(path, os.path.join(tablePath, fileName))
+                region['files'].append(fileName)
+                known[fileName] = stats
+            for store in {store for _, store, _, _ in loaded}:
+                fsyncDir(os.path.join(tablePath, store))
+            fsyncDir(tablePath)
+            self.writeMetadata((table[0], table[1]))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        for region in {region['id']: region for region, _, _, _ in loaded}.values():
+            self.splitRegion(table, region)
+
+        return f'\033[95m{cells} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+
+    @timed('get')
+    @locked('read')
+    def get(self, name, rowId, columns=None, timestamp=None, explain=False):
+        # columns: familias ('cf') o columnas ('cf:columna'). Devuelve un GetResult con las celdas
+        # en el orden de las columnas pedidas (o de la fila, si se piden familias o nada). Con
+        # explain, result.io['plan'] indica qué se hizo con cada HFile
+        inicio = time()
+        table = self.openTable(name, columns)
+
+        explicit = columns and all(':' in col for col in columns)
+        pairs = list(dict.fromkeys(tuple(col.split(':', 1)) for col in columns)) if explicit else None
+        io = newIO()
+        if explain:
+            io['plan'] = []
+        row = self.readRow(table, rowId, pairs, columns or None, io, self.getMVCC(table).readPoint)
+        self.readStats['bytes_read'] += io['bytes']
+        self.metrics.recordIO(tableKey(table), io)
+
+        if not explicit:
+            pairs = [(family, column) for family, qualifiers in row.items() for column in qualifiers]
+            if columns:
+                pairs = [(family, column) for family, column in pairs if family in columns or f'{family}:{column}' in columns]
+
+        cells = [Cell(rowId, family, column, ts, value) for family, column in pairs
+                 for ts, value in row.get(family, {}).get(column, {}).items() if not timestamp or ts == timestamp]
+        self.metrics.increment('read.cells', tableKey(table), len(cells))
+        return GetResult(rowId, cells, io, time() - inicio)
+
+    @locked('read')
+    def scan(self, name, startRow=None, stopRow=None, columns=None, rowLimit=None, explain=False):
+        # Devuelve un ScanResult que lee las celdas a medida que se recorre, sobre una snapshot
+        # de la tabla: no ve las escrituras posteriores a la llamada
+        table = self.openTable(name, columns)
+        io = newIO()
+        if explain:
+            io['plan'] = []
+        cells = self.scanCells(table, startRow, stopRow, columns, rowLimit, io)
+        return ScanResult(self.resultCells(table, cells, io), io)
+
+    def resultCells(self, table, cells, io):
+        # Las celdas se leen por tramos para medir el tiempo de lectura (io['read_seconds'])
+        # sin llamar al reloj por cada celda, y sin contar el tiempo de quien recorre el resultado
+        io['read_seconds'] = 0.0
+        io['cells'] = 0
+        try:
+            while True:
+                inicio = perf_counter()
+                chunk = list(islice(cells, 256))
+                io['read_seconds'] += perf_counter() - inicio
+                if not chunk:
+                    break
+                io['cells'] += len(chunk)
+                for rowId, family, column, ts, _, value in chunk:
+                    yield Cell(rowId, family, column, ts, value)
+        finally:
+            self.readStats['bytes_read'] += io['bytes']
+            self.metrics.observe('scan', tableKey(table), io['read_seconds'])
+            self.metrics.recordIO(tableKey(table), {k: v for k, v in io.items() if k not in ('read_seconds', 'source_seconds')})
+
+    def writeTombstone(self, table, rowId, cf, column, timestamp, kind, seq):
+        # Los borrados se registran como tombstones; los HFiles no se reescriben hasta la compactación mayor.
+        # Se llama dentro de MVCC.write(), que asigna seq y espera el fsync del WAL
+        memstore = self.getMemStore(table[0], table[1])
+        written = self.getWAL(table[0], table[1]).append({'row': rowId, 'cf': cf, 'column': column, 'timestamp': timestamp, 'type': kind, 'value': ''})
+        self.metrics.increment('write.wal_bytes', tableKey(table), written)
+        memstore.delete(rowId, cf, column, timestamp, kind, seq)
+
+    @timed('delete')
+    @locked('read', flush=True)
+    def deleteRow(self, name, rowId, column, timestamp=None):
         inicio = time()
         table = self.verifyTable(name)
 
@@ -614,37 +1217,33 @@ class HBase:
         if not table[3]:
             return f"\033[91mTableDisabledException: La tabla '{table[1]}' está deshabilitada.\033[0m"
         
-        if ':' not in column:
-            return f"\033[91mERROR: Debe especificar el column family al que pertenece la columna\033[0m"
-        
-        cf, column = column.split(':')
+        cf, column = column.split(':') if ':' in column else (column, None)
 
         if cf not in table[2]:
             return f"\033[91mFamilyNotFoundException: La familia '{cf}' no existe en la tabla '{table[1]}'\033[0m"
         
-        hfiles = {}
-        
-        table_path = os.path.join(f'namespaces/{table[0]}', table[1])
-        files = glob.glob(os.path.join(table_path, "*"))
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    hfile = json.load(f)
-                    if 'data' in hfile.keys():
-                        hfiles[file_path] = hfile
-                        
-        for file_path, hfile in hfiles.items():
-            r = hfile['data']
-            if rowId in r.keys():
-                try:
-                    del r[rowId][cf][column][timestamp]
-                    with open(file_path, 'w') as f:
-                        json.dump(hfile, f, indent=2)
-                except:
-                    return f'\033[95m{0} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'            
-            continue
-        return f'\033[95m{1} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+        current = self.readRow(table, rowId, [(cf, column)] if column is not None else None).get(cf, {})
+        cf = self.familyMap(table)[cf]
+
+        with self.getMVCC(table).write(self.getWAL(table[0], table[1])) as seq:
+            now = str(datetime.now().timestamp())
+            # Solo se escribe el tombstone si hay celdas visibles que borrar
+            if column is None:
+                rows = 1 if current else 0
+                if rows:
+                    self.writeTombstone(table, rowId, cf, '', now, DELETE_FAMILY, seq)
+            elif timestamp is None:
+                rows = 1 if column in current else 0
+                if rows:
+                    self.writeTombstone(table, rowId, cf, column, now, DELETE_COLUMN, seq)
+            else:
+                rows = 1 if timestamp in current.get(column, {}) else 0
+                if rows:
+                    self.writeTombstone(table, rowId, cf, column, timestamp, DELETE, seq)
+        return f'\033[95m{rows} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
     
+    @timed('deleteall')
+    @locked('read', flush=True)
     def deleteAll(self, name, rowId):
         inicio = time()
         table = self.verifyTable(name)
@@ -658,64 +1257,63 @@ class HBase:
         if not table[3]:
             return f"\033[91mTableDisabledException: La tabla '{table[1]}' está deshabilitada.\033[0m"
         
-        hfiles = {}
-        
-        table_path = os.path.join(f'namespaces/{table[0]}', table[1])
-        files = glob.glob(os.path.join(table_path, "*"))
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    hfile = json.load(f)
-                    if 'data' in hfile.keys():
-                        hfiles[file_path] = hfile
-
-        rows = 0                        
-        for file_path, hfile in hfiles.items():
-            r = hfile['data']
-            if rowId in r.keys():
-                rows = 0
-                for _, columns in r[rowId].items():
-                    for col in columns.items():
-                        rows += len(col[1])
-                    # rows += len(columns)
-                r.pop(rowId)
-                with open(file_path, 'w') as f:
-                        json.dump(hfile, f, indent=2)
-            continue
+        rows = 0
+        for columns in self.readRow(table, rowId).values():
+            for versions in columns.values():
+                rows += len(versions)
+
+        # Como en HBase, deleteall escribe un tombstone de familia en cada store. Todos llevan el
+        # mismo seq, así que un scan ve la fila completa o borrada
+        if rows:
+            with self.getMVCC(table).write(self.getWAL(table[0], table[1])) as seq:
+                now = str(datetime.now().timestamp())
+                for cf in self.familyMap(table).values():
+                    self.writeTombstone(table, rowId, cf, '', now, DELETE_FAMILY, seq)
         
         return f'\033[95m{rows} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
     
-    def countRows(self, name, embedded=False):
-        inicio = time()
-        table = self.verifyTable(name)
-
-        if not isinstance(table,tuple):
-            return table
-
-        if len(table) == 2:
-            return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m" if not embedded else None
-        
-        hfiles = {}
-        
-        table_path = os.path.join(f'namespaces/{table[0]}', table[1])
-        files = glob.glob(os.path.join(table_path, "*"))
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    hfile = json.load(f)
-                    if 'data' in hfile.keys():
-                        hfiles[file_path] = hfile
-
-        rows = 0                        
-        for file_path, hfile in hfiles.items():
-            r = hfile['data']
-            for rowId in r.keys():
-                for _, columns in r[rowId].items():
-                    for col in columns.items():
-                        rows += len(col[1])
-        
-        return f'\033[95m{rows} \033[96mrow\033[0m(s)\033[0m' if not embedded else rows
+    @timed('count')
+    @locked('read')
+    def count(self, name, exact=False):
+        table = self.openTable(name, enabled=False)
+        if exact:
+            return sum(1 for _ in self.scanCells(table))
+
+        rows = self.countFromStats(table)
+        if rows is None:
+            return sum(1 for _ in self.scanCells(table))
+        return rows
+
+    def countFromStats(self, table):
+        # Conteo desde el catálogo: los puts de las familias vigentes en los HFiles y la MemStore.
+        # Devuelve None si las estadísticas pueden contar celdas que una lectura no devuelve: con
+        # tombstones sin compactar (uno puede ocultar cualquier cantidad de celdas) o si alguna
+        # columna de una región puede tener más versiones de las que permite VERSIONS
+        stats = self.tableStats(table)
+        memstore = self.memstores.get((table[0], table[1]))
+        stores = dict(memstore.stores) if memstore is not None else {}
+        if stats['deletes'] or any(store.deletes for store in stores.values()):
+            return None
+
+        families = self.familyMap(table)
+        versions = self.familyVersions(table)
+        # Nombre físico -> VERSIONS; las familias eliminadas no se cuentan
+        live = {families[cf]: versions[cf] for cf in table[2] if cf in families}
+        rows = sum(store.puts for cf, store in stores.items() if cf in live)
+        with self.catalog.lock:
+            known = self.metadata[table[0]][table[1]]['hfile_stats']
+            for region in self.getRegions(table[0], table[1]):
+                files = [known[f]['families'] for f in region['files']]
+                for cf, maxVersions in live.items():
+                    # Cota de las versiones de una columna: las de cada archivo más las de la MemStore
+                    bound = sum(f[cf]['max_versions'] for f in files if cf in f)
+                    bound += stores[cf].maxVersions if cf in stores else 0
+                    if bound > maxVersions:
+                        return None
+                    rows += sum(f[cf]['puts'] for f in files if cf in f)
+        return rows
     
+    @locked('write')
     def truncateTable(self,name):
         inicio = time()
         table = self.verifyTable(name)
@@ -727,8 +1325,9 @@ class HBase:
         if len(table) == 2:
             return f"\033[91mTableNotFoundException: La tabla '{table[1]}' no existe en el namespace '{table[0]}'\033[0m"
         
-        rows = self.countRows(f'{table[0]}:{table[1]}', embedded=True)
-        if rows == None:
+        try:
+            rows = self.count(f'{table[0]}:{table[1]}')
+        except HBaseError:
             return f"\033[91mCouldn't count {table[0]}:{table[1]} rows\033[0m\n"
         
         result += "   - Disabling table...\n"
@@ -747,6 +1346,61 @@ class HBase:
         
         return result
     
+    def getStatus(self):
+        inicio = time()
+        checks = self.bloomStats['checks']
+        negatives = self.bloomStats['skipped'] + self.bloomStats['false_positives']
+        headers = ['\033[32mMÉTRICA\033[0m','\033[32mVALOR\033[0m']
+        data = [
+            ['bloom.type', self.bloomFilter],
+            ['bloom.checks', checks],
+            ['bloom.files_skipped', self.bloomStats['skipped']],
+            ['bloom.false_positives', self.bloomStats['false_positives']],
+            ['bloom.false_positive_rate', round(self.bloomStats['false_positives'] / negatives, 4) if negatives else 0],
+            ['cache.capacity_bytes', self.blockCache.capacity],
+            ['cache.resident_bytes', self.blockCache.residentBytes],
+            ['cache.entries', len(self.blockCache.entries)],
+            ['cache.hits', self.blockCache.hits],
+            ['cache.misses', self.blockCache.misses],
+            ['cache.evictions', self.blockCache.evictions],
+            ['cache.hit_ratio', round(self.blockCache.hitRatio(), 4)],
+            ['get.count', self.readStats['gets']],
+            ['get.files_read_avg', round(self.readStats['files_read'] / self.readStats['gets'], 4) if self.readStats['gets'] else 0],
+            ['read.bytes', self.readStats['bytes_read']]
+        ]
+        result = tabulate(data, headers=headers, tablefmt="plain")
+        result += f'\n\n\033[95m{len(data)} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+        return result
+
+    def getMetrics(self, name=None):
+        inicio = time()
+        if name == 'reset':
+            self.metrics.reset()
+            return f'\033[95m0 \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+
+        table = tableKey(name) if name else None
+        snapshot = self.metrics.snapshot(table)
+
+        headers = ['\033[32mCONTADOR\033[0m','\033[32mTABLA\033[0m','\033[32mVALOR\033[0m']
+        counters = []
+        for metric, tables in snapshot['counters'].items():
+            for t, value in tables.items():
+                counters.append([metric, t or '-', f'{value:.6f}' if isinstance(value, float) else value])
+
+        histogramHeaders = ['\033[32mOPERACIÓN\033[0m','\033[32mTABLA\033[0m','\033[32mCOUNT\033[0m','\033[32mAVG (ms)\033[0m',
+                            '\033[32mP50 (ms)\033[0m','\033[32mP95 (ms)\033[0m','\033[32mP99 (ms)\033[0m','\033[32mMAX (ms)\033[0m']
+        histograms = []
+        for operation, tables in snapshot['histograms'].items():
+            for t, h in tables.items():
+                histograms.append([operation, t or '-', h['count']] + [round(h[k] / 1000, 3) for k in ('avg_us', 'p50_us', 'p95_us', 'p99_us', 'max_us')])
+
+        result = f'Uptime: {snapshot["uptime_seconds"]} seconds\n\n'
+        result += tabulate(histograms, headers=histogramHeaders, tablefmt="plain")
+        result += '\n\n'
+        result += tabulate(counters, headers=headers, tablefmt="plain")
+        result += f'\n\n\033[95m{len(counters) + len(histograms)} \033[96mrow\033[0m(s) in \033[95m{round(time() - inicio,6)} \033[0mseconds'
+        return result
+
     def getHelp(self,command=None):
         result = ''
         helps = {
@@ -757,17 +1411,25 @@ class HBase:
             'disable <namespace>?:<table_name>': "DDL => Deshabilita la tabla indicada. Si no se especifica el namespace, se tomará el namespace 'default'.",
             'enable <namespace>?:<table_name>': "DDL => Habilita la tabla indicada. Si no se especifica el namespace, se tomará el namespace 'default'.",
             'is_enabled <namespace>?:<table_name>': "DDL => Verifica el estado de la tabla descrita. Si no se especifica el namespace, se tomará el namespace 'default'.",
-            "alter <namespace>?:<table_name> {NAME => <column_family>, [METHOD => 'add' | 'delete']?}": "DDL => Modifica la tabla descrita. El método 'add' añade el column family a la tabla, mientras que el método 'delete' la elimina de la tabla, así como todos los registros asignados a ella. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "alter <namespace>?:<table_name> {NAME => <column_family>, [METHOD => 'add' | 'delete' | 'modify']?, [NEW => <column_family>]?, [VERSIONS => <n>]?}": "DDL => Modifica la tabla descrita. El método 'add' añade el column family a la tabla, el método 'delete' la elimina de la tabla, así como todos los registros asignados a ella, y el método 'modify' la renombra a NEW. El cambio se registra en el catálogo sin reescribir los HFiles. VERSIONS indica cuántas versiones de cada celda conserva el column family. Si no se especifica el namespace, se tomará el namespace 'default'.",
             "drop <namespace>?:<table_name>": "DDL => Elimina la tabla descrita y todo su contenido. Si no se especifica el namespace, se tomará el namespace 'default'.",
             "drop_all [<namespace>?:regex]?": "DDL => Elimina todas las tablas que coincidan con los parámetros dados. Si se especifica una regex, eliminará las tablas que coincidan. Si no se especifica el namespace, se tomará el namespace 'default'.",
             "describe <namespace>?:<table_name>": "DDL => Proporciona una breve descripción de la tabla indicada. Si no se especifica el namespace, se tomará el namespace 'default'.",
             "put <namespace>?:<table_name> <row_Id> <column_family>:<column> <value>": "DML => Crea un nuevo registro dentro de la tabla y columna indicadas, con el row_Id dado y el nuevo valor. Si ya hay un registro con esta combinación de <namespace>:<table_name> <row_Id> y <column_family>:<column>, se agregará un segundo valor como el más actualizado, manteniendo una copia de seguridad del antiguo. Si no se especifica el namespace, se tomará el namespace 'default'.",
             "get <namespace>?:<table_name> <row_Id> [<column_family>:<column>]?": "DML => Devuelve la fila que coincida con el row_id dado. Se pueden especificar las columnas que se deben devolver, con su column family respectivo. Si no se especifica el namespace, se tomará el namespace 'default'.",
-            "scan <namespace>?:<table_name>": "DML => Devuelve todas las filas de la tabla indicada. Si no se especifica el namespace, se tomará el namespace 'default'.",
-            "delete <namespace>?:<table_name> <row_Id> <column_family>:<column> <timestamp>": "DML => Elimina la fila que coincida con todos los parámetros. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "scan <namespace>?:<table_name> <limit>? <offset>? {STARTROW => <row_Id>, STOPROW => <row_Id>, LIMIT => <rows>, COLUMNS => [<column_family>:<column>]}?": "DML => Devuelve las filas de la tabla indicada en orden de row_Id. STARTROW (inclusivo) y STOPROW (exclusivo) acotan el rango, LIMIT indica el número máximo de filas y COLUMNS las familias o columnas a devolver. La lectura se detiene en cuanto se cumple el límite. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "explain get|scan <argumentos de get o scan>": "DML => Ejecuta el get o scan indicado y, en lugar de su resultado, muestra el plan de lectura (qué se hizo con la MemStore y con cada HFile: leído, recorrido u omitido por el bloom filter, la column family o el rango de filas) y su costo: bytes, bloques decodificados, aciertos de caché, celdas leídas y devueltas y el tiempo de cada etapa.",
+            "bulk_load <namespace>?:<table_name> <file> <field>=HBASE_ROW_KEY,<field>=<column_family>:<column>,...": "DML => Carga un archivo CSV (con encabezado) o JSON lines en la tabla. El mapeo indica qué campo es el row_Id y en qué columna se guarda cada campo. Los HFiles se escriben directamente y se añaden a la tabla al terminar la carga. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "delete <namespace>?:<table_name> <row_Id> <column_family>[:<column>]? <timestamp>?": "DML => Elimina la versión indicada por el timestamp, todas las versiones de la columna si no se indica timestamp, o toda la familia si no se indica columna. Si no se especifica el namespace, se tomará el namespace 'default'.",
             "deleteall <namespace>?:<table_name> <row_Id>": "DML => Elimina todas las filas con el row_Id indicado. Si no se especifica el namespace, se tomará el namespace 'default'.",
-            "count <namespace>?:<table_name>": "DML => Cuenta la cantidad de filas en la tabla indicada. Si no se especifica el namespace, se tomará el namespace 'default'.",
-            "truncate <namespace>?:<table_name>": "DML => Elimina todo el contenido de la tabla, manteniendo la estructura básica. Si no se especifica el namespace, se tomará el namespace 'default'."
+            "count <namespace>?:<table_name> {EXACT => true}?": "DML => Cuenta la cantidad de filas en la tabla indicada a partir de las estadísticas del catálogo, o recorriéndola si tiene borrados sin compactar o columnas que pueden superar su límite de VERSIONS. Con EXACT => true recorre toda la tabla. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "truncate <namespace>?:<table_name>": "DML => Elimina todo el contenido de la tabla, manteniendo la estructura básica. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "convert <namespace>?:<table_name>": "DDL => Convierte los HFiles en formato JSON de la tabla indicada al formato binario. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "migrate [<namespace>?:<table_name>]?": "ADMIN => Elimina el flag 'enabled' de los HFiles JSON de la tabla indicada (o de todas las tablas), ya que el estado de la tabla solo se guarda en el catálogo. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "compact <namespace>?:<table_name>": "ADMIN => Ejecuta una compactación menor: une en un solo HFile los archivos de cada column family (store) que tenga más de uno en una región y aplica el límite de VERSIONS de cada column family. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "major_compact <namespace>?:<table_name>": "ADMIN => Ejecuta una compactación mayor: reescribe cada región en un único HFile por column family, aplica el límite de VERSIONS y elimina los datos borrados. Si no se especifica el namespace, se tomará el namespace 'default'.",
+            "status": "ADMIN => Muestra las estadísticas internas del servidor, como los aciertos y falsos positivos de los bloom filters y el uso del block cache.",
+            "metrics [<namespace>?:<table_name> | reset]?": "ADMIN => Muestra las latencias (count, promedio, p50, p95, p99 y máximo) de cada comando y operación interna, y los contadores de archivos y bytes leídos y escritos, por tabla y en total ('*'). Con una tabla solo muestra sus métricas; 'reset' las reinicia."
         }
         
         if command:
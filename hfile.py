@@ -0,0 +1,369 @@
+import os
+import json
+import mmap
+import struct
+from time import perf_counter
+from bisect import bisect_right
+from keyvalue import rowKey, sortedCells, PUT, DELETE_FAMILY, DELETE_ROW
+from bloom import BloomFilter, rowColumnKey
+from durable import atomicWrite
+
+# Formato binario de un HFile:
+#   [bloque de datos]* [metadata JSON] [índice de bloques] [trailer]
+# Cada bloque contiene filas completas ordenadas por row_Id; dentro de una fila las
+# celdas se ordenan por familia, columna y timestamp descendente. El índice guarda
+# la primera fila de cada bloque junto a su offset y tamaño, y el trailer (tamaño fijo
+# al final del archivo) indica dónde empiezan la metadata y el índice.
+
+MAGIC = b'HFILEv1\0'
+TRAILER = struct.Struct('>8sQIQIII')
+BLOCK_SIZE = 4 * 1024
+
+# Estimación de memoria ocupada por cada celda decodificada (tupla y strings)
+DECODED_CELL_OVERHEAD = 120
+
+ROW = 'ROW'
+ROWCOL = 'ROWCOL'
+
+def hfileIndex(fileName):
+    return int(os.path.basename(fileName).split('_')[1].split('.')[0])
+
+def storeOf(fileName):
+    # Los HFiles se registran relativos a la tabla: '<familia>/HFile_N.hfile', o 'HFile_N' en la raíz
+    return fileName.rsplit('/', 1)[0] if '/' in fileName else ''
+
+def encodeCell(cell):
+    rowId, cf, column, ts, kind, value = [c.encode('utf-8') if isinstance(c, str) else c for c in cell]
+    return b''.join([
+        struct.pack('>H', len(rowId)), rowId,
+        struct.pack('>B', len(cf)), cf,
+        struct.pack('>H', len(column)), column,
+        struct.pack('>B', len(ts)), ts,
+        struct.pack('>BI', kind, len(value)), value
+    ])
+
+def decodeBlock(buf):
+    cells = []
+    pos = 0
+    while pos < len(buf):
+        size, = struct.unpack_from('>H', buf, pos); pos += 2
+        rowId = buf[pos:pos + size].decode('utf-8'); pos += size
+        size, = struct.unpack_from('>B', buf, pos); pos += 1
+        cf = buf[pos:pos + size].decode('utf-8'); pos += size
+        size, = struct.unpack_from('>H', buf, pos); pos += 2
+        column = buf[pos:pos + size].decode('utf-8'); pos += size
+        size, = struct.unpack_from('>B', buf, pos); pos += 1
+        ts = buf[pos:pos + size].decode('utf-8'); pos += size
+        kind, size = struct.unpack_from('>BI', buf, pos); pos += 5
+        value = buf[pos:pos + size].decode('utf-8'); pos += size
+        cells.append((rowId, cf, column, ts, kind, value))
+    return cells
+
+def cellBloomKeys(cell, bloomType):
+    # Con ROWCOL los tombstones de familia y de fila se registran con columna (o familia) vacía
+    rowId, cf, column, _, kind, _ = cell
+    if bloomType != ROWCOL:
+        return (rowId,)
+    if kind == DELETE_ROW:
+        return (rowId, rowColumnKey(rowId, '', ''))
+    if kind == DELETE_FAMILY:
+        return (rowId, rowColumnKey(rowId, cf, ''))
+    return (rowId, rowColumnKey(rowId, cf, column))
+
+def bloomFromKeys(keys, errorRate):
+    bloom = BloomFilter.forCapacity(len(keys), errorRate)
+    for key in keys:
+        bloom.add(key)
+    return bloom
+
+def buildBloom(cells, bloomType, errorRate):
+    keys = set()
+    for cell in cells:
+        keys.update(cellBloomKeys(cell, bloomType))
+    return bloomFromKeys(keys, errorRate)
+
+def emptyStats():
+    # families: puts de cada familia (nombre físico) y la mayor cantidad de versiones de una columna
+    return {'cells': 0, 'rows': 0, 'bytes': 0, 'puts': 0, 'deletes': 0, 'first_row': None, 'last_row': None, 'families': {}}
+
+def updateStats(stats, cell, size, previous=None):
+    # previous: la celda anterior del archivo, para contar las versiones seguidas de cada columna
+    if cell[0] != stats['last_row']:
+        stats['rows'] += 1
+        if stats['first_row'] is None:
+            stats['first_row'] = cell[0]
+        stats['last_row'] = cell[0]
+    stats['cells'] += 1
+    stats['bytes'] += size
+    stats['puts' if cell[4] == PUT else 'deletes'] += 1
+    if cell[4] == PUT:
+        family = stats['families'].setdefault(cell[1], {'puts': 0, 'max_versions': 0, 'versions': 0})
+        same = previous is not None and previous[4] == PUT and previous[:3] == cell[:3]
+        family['versions'] = family['versions'] + 1 if same else 1
+        family['puts'] += 1
+        family['max_versions'] = max(family['max_versions'], family['versions'])
+
+def closeStats(stats):
+    for family in stats['families'].values():
+        family.pop('versions', None)
+    return stats
+
+def writeHFile(path, metadata, cells, bloomType=ROW, errorRate=0.01):
+    # cells debe estar ordenado (ver keyvalue.cellKey). Se escribe en una sola pasada: la
+    # metadata (con el bloom filter) va después de los bloques, así que cells puede ser un generador.
+    # El archivo aparece en path solo cuando está completo y en disco
+    metadata = {k: v for k, v in metadata.items() if k != 'bloom'}
+    keys = set()
+    index = []
+    offset = 0
+    stats = emptyStats()
+    previous = None
+
+    with atomicWrite(path, 'wb') as f:
+        block = bytearray()
+        firstRow = None
+        lastRow = None
+        for cell in cells:
+            # Los bloques solo se cortan entre filas para que una fila nunca quede partida
+            if cell[0] != lastRow and len(block) >= BLOCK_SIZE:
+                index.append((firstRow, offset, len(block)))
+                f.write(block)
+                offset += len(block)
+                block = bytearray()
+            if not block:
+                firstRow = cell[0]
+            lastRow = cell[0]
+            encoded = encodeCell(cell)
+            block += encoded
+            updateStats(stats, cell, len(encoded), previous)
+            previous = cell
+            if bloomType:
+                keys.update(cellBloomKeys(cell, bloomType))
+        if block:
+            index.append((firstRow, offset, len(block)))
+            f.write(block)
+            offset += len(block)
+
+        if bloomType:
+            metadata['bloom'] = {'type': bloomType, **bloomFromKeys(keys, errorRate).toJSON()}
+        metadata['stats'] = closeStats(stats)
+        meta = json.dumps(metadata).encode('utf-8')
+        metaOffset = offset
+        f.write(meta)
+        offset += len(meta)
+
+        indexBytes = bytearray()
+        for firstRow, blockOffset, blockSize in index:
+            key = firstRow.encode('utf-8')
+            indexBytes += struct.pack('>H', len(key)) + key + struct.pack('>QI', blockOffset, blockSize)
+        f.write(indexBytes)
+        f.write(TRAILER.pack(MAGIC, metaOffset, len(meta), offset, len(indexBytes), len(index), stats['cells']))
+    return stats
+
+def writeJsonHFile(path, metadata, data):
+    # El estado de la tabla solo se guarda en el catálogo
+    metadata = {k: v for k, v in metadata.items() if k != 'enabled'}
+    with atomicWrite(path) as f:
+        json.dump({'metadata': metadata, 'data': data}, f, indent=2)
+
+def stripEnabledFlag(path):
+    with open(path, 'r') as f:
+        hfile = json.load(f)
+    if 'enabled' not in hfile.get('metadata', {}):
+        return False
+    writeJsonHFile(path, hfile['metadata'], hfile.get('data', {}))
+    return True
+
+def newIO():
+    # Contadores de lectura que acumulan los lectores: bytes leídos (del disco o del cache),
+    # archivos abiertos, bloques decodificados (fallos del cache), aciertos del cache, celdas
+    # leídas de los bloques y segundos decodificando. HBase suma discovery_seconds al buscar
+    # las regiones y HFiles de una lectura y filter_seconds al aplicar tombstones y versiones
+    return {'bytes': 0, 'files': 0, 'blocks_decoded': 0, 'cache_hits': 0, 'cells_read': 0,
+            'decode_seconds': 0.0, 'discovery_seconds': 0.0, 'filter_seconds': 0.0}
+
+def mergeIO(total, io):
+    for key, value in io.items():
+        total[key] = total.get(key, 0) + value
+
+def fileVersion(path):
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+class HFileReader:
+    # io: diccionario opcional donde se acumulan los bytes de bloques leídos (del disco o del cache)
+    def __init__(self, path, cache=None, io=None):
+        self.path = path
+        self.cache = cache
+        self.io = io
+        self.mm = None
+        self.version = fileVersion(path)
+        if io is not None:
+            io['files'] += 1
+
+        header = cache.get(self.version + ('header',)) if cache else None
+        if header is None:
+            header = self.readHeader()
+            if cache:
+                cache.put(self.version + ('header',), header, indexSize(header))
+        self.meta, self.firstRows, self.blocks, self.cellCount = header
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+    def map(self):
+        if self.mm is None:
+            with open(self.path, 'rb') as f:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.mm
+
+    def readHeader(self):
+        mm = self.map()
+        magic, metaOffset, metaSize, indexOffset, indexSize, blocks, cellCount = TRAILER.unpack_from(mm, len(mm) - TRAILER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{self.path}' no es un HFile válido")
+
+        meta = json.loads(mm[metaOffset:metaOffset + metaSize])
+        firstRows = []
+        offsets = []
+        pos = indexOffset
+        for _ in range(blocks):
+            size, = struct.unpack_from('>H', mm, pos); pos += 2
+            firstRows.append(rowKey(mm[pos:pos + size].decode('utf-8'))); pos += size
+            offsets.append(struct.unpack_from('>QI', mm, pos)); pos += 12
+        return meta, firstRows, offsets, cellCount
+
+    @property
+    def bloom(self):
+        if 'bloom' not in self.meta:
+            return None
+        return BloomFilter.fromJSON(self.meta['bloom'])
+
+    @property
+    def bloomType(self):
+        return self.meta['bloom']['type'] if 'bloom' in self.meta else None
+
+    def readBlock(self, i):
+        cells = self.cache.get(self.version + (i,)) if self.cache else None
+        if cells is None:
+            offset, size = self.blocks[i]
+            inicio = perf_counter()
+            cells = decodeBlock(self.map()[offset:offset + size])
+            if self.io is not None:
+                self.io['blocks_decoded'] += 1
+                self.io['decode_seconds'] += perf_counter() - inicio
+            if self.cache:
+                self.cache.put(self.version + (i,), cells, size + DECODED_CELL_OVERHEAD * len(cells))
+        elif self.io is not None:
+            self.io['cache_hits'] += 1
+        if self.io is not None:
+            self.io['bytes'] += self.blocks[i][1]
+            self.io['cells_read'] += len(cells)
+        return cells
+
+    def getRowCells(self, rowId):
+        i = bisect_right(self.firstRows, rowKey(rowId)) - 1
+        if i < 0:
+            return []
+        return [c for c in self.readBlock(i) if c[0] == rowId]
+
+    def cells(self, startRow=None):
+        first = max(bisect_right(self.firstRows, rowKey(startRow)) - 1, 0) if startRow else 0
+        for i in range(first, len(self.blocks)):
+            yield from self.readBlock(i)
+
+class JsonHFileReader:
+    def __init__(self, path, cache=None, io=None):
+        self.path = path
+        self.io = io
+        self.version = fileVersion(path)
+        if io is not None:
+            io['bytes'] += self.version[2]
+            io['files'] += 1
+
+        hfile = cache.get(self.version + ('json',)) if cache else None
+        if hfile is None:
+            inicio = perf_counter()
+            with open(path, 'r') as f:
+                hfile = json.load(f)
+            if io is not None:
+                io['blocks_decoded'] += 1
+                io['decode_seconds'] += perf_counter() - inicio
+            if cache:
+                cache.put(self.version + ('json',), hfile, self.version[2] * 2)
+        elif io is not None:
+            io['cache_hits'] += 1
+        self.meta = hfile.get('metadata', {})
+        self.data = hfile.get('data', {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        pass
+
+    @property
+    def bloom(self):
+        # Los HFiles JSON no guardan filtro; se construye al leerlos por primera vez
+        return buildBloom(sortedCells(self.data), ROW, 0.01)
+
+    @property
+    def bloomType(self):
+        return ROW
+
+    def getRowCells(self, rowId):
+        cells = list(sortedCells({rowId: self.data[rowId]})) if rowId in self.data else []
+        if self.io is not None:
+            self.io['cells_read'] += len(cells)
+        return cells
+
+    def cells(self, startRow=None):
+        for cell in sortedCells(self.data):
+            if self.io is not None:
+                self.io['cells_read'] += 1
+            yield cell
+
+def indexSize(header):
+    meta, firstRows, offsets, _ = header
+    return len(json.dumps(meta)) + sum(len(k) + 64 for k in firstRows)
+
+def openHFile(path, cache=None, io=None):
+    if path.endswith('.json'):
+        return JsonHFileReader(path, cache, io)
+    return HFileReader(path, cache, io)
+
+def scanHFile(path, cache=None, startRow=None, io=None):
+    with openHFile(path, cache, io) as reader:
+        yield from reader.cells(startRow)
+
+def fileStats(path, cache=None):
+    # Los HFiles escritos antes de guardar estadísticas por familia (y los JSON) se recorren una sola vez
+    with openHFile(path, cache) as reader:
+        if 'families' in reader.meta.get('stats', {}):
+            return reader.meta['stats']
+        stats = emptyStats()
+        previous = None
+        for cell in reader.cells():
+            updateStats(stats, cell, len(encodeCell(cell)), previous)
+            previous = cell
+        return closeStats(stats)
+
+def convertHFile(path, bloomType=ROW, errorRate=0.01):
+    with JsonHFileReader(path) as reader:
+        metadata = {k: v for k, v in reader.meta.items() if k != 'enabled'}
+        newPath = path[:-len('.json')] + '.hfile'
+        writeHFile(newPath, metadata, sortedCells(reader.data), bloomType, errorRate)
+    # El archivo JSON lo borra quien llama, después de registrar el nuevo en el catálogo
+    return newPath
@@ -0,0 +1,33 @@
+# Una celda es la tupla (row_Id, familia, columna, timestamp, tipo, valor). Las celdas
+# se ordenan como en HBase: por row_Id en orden de bytes, familia, columna, timestamp
+# descendente y, ante el mismo timestamp, los borrados antes que los puts.
+#
+# Los tombstones de familia usan columna '' y los de fila familia y columna '', de modo
+# que siempre aparecen antes que las celdas que ocultan.
+
+PUT = 4
+DELETE = 8
+DELETE_COLUMN = 12
+DELETE_FAMILY = 14
+DELETE_ROW = 16
+
+def rowKey(rowId):
+    return rowId.encode('utf-8')
+
+def cellKey(cell):
+    return (rowKey(cell[0]), cell[1], cell[2], -float(cell[3]), -cell[4])
+
+def sortedCells(data):
+    for rowId in sorted(data, key=rowKey):
+        for cf in sorted(data[rowId]):
+            for column in sorted(data[rowId][cf]):
+                versions = data[rowId][cf][column]
+                for ts in sorted(versions, key=float, reverse=True):
+                    yield (rowId, cf, column, ts, PUT, versions[ts])
+
+def cellsToRows(cells):
+    rows = {}
+    for rowId, cf, column, ts, kind, value in cells:
+        if kind == PUT:
+            rows.setdefault(rowId, {}).setdefault(cf, {}).setdefault(column, {})[ts] = value
+    return rows
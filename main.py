@@ -1,7 +1,8 @@
 import tkinter as tk
-import subprocess
 import os
 import re
+import queue
+import threading
 from hbase import *
 from commandSelector import *
 
@@ -16,6 +17,12 @@ class CmdEmulator:
         '93':'yellow',
         '91':'red',
     }
+    ANSI_ESCAPE = re.compile(r'\033\[(\d+)m')
+    # La consola conserva como mucho SCROLLBACK_LINES líneas; la salida de un comando se
+    # inserta en lotes de BATCH_SEGMENTS segmentos de color por cada ciclo del event loop
+    SCROLLBACK_LINES = 5000
+    BATCH_SEGMENTS = 500
+    POLL_MS = 10
 
     def __init__(self, root):
         self.hbase = HBase()
@@ -26,6 +33,8 @@ class CmdEmulator:
         root.configure(bg="black")
         self.history = []
         self.history_pointer = -1
+        self.busy = False
+        self.results = queue.Queue()
 
         self.output_text = tk.Text(root, height=25, width=110, padx=10, pady=10,
                                     bg="black", fg="white", insertbackground="white", font=("Consolas", 11), undo=True, selectbackground='white',
@@ -42,6 +51,8 @@ class CmdEmulator:
             self.output_text.tag_configure(code, foreground=color)
             
     def on_paste(self, event):
+        if self.busy:
+            return "break"
         try:
             pasted_text = self.root.clipboard_get()
             self.output_text.insert(tk.INSERT, pasted_text)
@@ -61,6 +72,9 @@ class CmdEmulator:
         return
         
     def on_key(self, event):
+        if self.busy and event.keysym not in ["Left", "Right", "Prior", "Next"]:
+            # Mientras se ejecuta un comando no se puede escribir
+            return "break"
         if event.keysym == "BackSpace":
             if self.chars <= 0:
                 return "break"
@@ -125,19 +139,71 @@ class CmdEmulator:
             self.execute_command(command)
         
     def execute_command(self, command):
+        # El comando se ejecuta en otro hilo y la salida se inserta desde el event loop de Tk
         self.chars = 0
+        self.busy = True
+        self.output_text.insert(tk.END, "\n")
+        threading.Thread(target=self.run_command, args=(command,), daemon=True).start()
+        self.root.after(self.POLL_MS, self.poll_output)
+
+    def run_command(self, command):
         try:
-            output = commandSelector(self.hbase, command)
-            self.display_output(output)
-        except subprocess.CalledProcessError as e:
-            self.display_output(e.output + e.stderr)
-            
+            output = str(commandSelector(self.hbase, command))
+        except Exception as e:
+            output = f"\033[91mError: {e}\033[0m"
+
+        batch = []
+        for text, tag in self.ansi_segments(self.tail(output)):
+            batch += [text, tag]
+            if len(batch) >= 2 * self.BATCH_SEGMENTS:
+                self.results.put(batch)
+                batch = []
+        self.results.put(batch)
+        self.results.put(None)
+
+    def poll_output(self):
+        # Inserta un lote por ciclo para que la consola siga respondiendo con salidas grandes
+        try:
+            batch = self.results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.POLL_MS, self.poll_output)
+            return
+
+        if batch is None:
+            self.display_output('')
+            self.busy = False
+            return
+        if batch:
+            self.output_text.insert(tk.END, *batch)
+            self.trim_scrollback()
+            self.output_text.see(tk.END)
+        self.root.after(1, self.poll_output)
+
     def display_output(self, output):
-        self.output_text.insert(tk.END, "\n")
         self.parse_ansi(output)
         self.output_text.insert(tk.END, "\n")
         self.output_text.insert(tk.END, f"\n{self.prompt}")
+        self.trim_scrollback()
         self.output_text.see(tk.END)
+        # El historial de undo de tk.Text también guarda las inserciones de la salida
+        self.output_text.edit_reset()
+
+    def tail(self, text):
+        # De una salida más larga que la consola solo se insertan las últimas SCROLLBACK_LINES líneas
+        cut = len(text)
+        for _ in range(self.SCROLLBACK_LINES):
+            cut = text.rfind("\n", 0, cut)
+            if cut == -1:
+                return text
+        codes = self.ANSI_ESCAPE.findall(text, 0, cut)
+        color = f"\033[{codes[-1]}m" if codes else ""
+        omitted = text.count("\n", 0, cut) + 1
+        return f"\033[93m... {omitted} line(s) omitted\033[0m\n{color}{text[cut + 1:]}"
+
+    def trim_scrollback(self):
+        lines = int(self.output_text.index("end-1c").split(".")[0])
+        if lines > self.SCROLLBACK_LINES:
+            self.output_text.delete("1.0", f"{lines - self.SCROLLBACK_LINES + 1}.0")
 
     def clear_console(self, event=None):
         self.output_text.delete(1.0, tk.END)
@@ -145,36 +211,25 @@ class CmdEmulator:
         self.chars = 0
         return "break"
 
-    def parse_ansi(self, text):
-        """Parse ANSI color codes and insert text with appropriate tags."""
-        ansi_escape = re.compile(r'\033\[(\d+)m')
+    def ansi_segments(self, text):
+        """Split text into (fragment, tag) pairs according to its ANSI color codes."""
         pos = 0
-        current_tag = None
-
-        while pos < len(text):
-            match = ansi_escape.search(text, pos)
-            if not match:
-                self.output_text.insert(tk.END, text[pos:], current_tag)
-                break
-
-            start, end = match.span()
-            if start > pos:
-                self.output_text.insert(tk.END, text[pos:start], current_tag)
-
+        tag = ()
+        for match in self.ANSI_ESCAPE.finditer(text):
+            if match.start() > pos:
+                yield text[pos:match.start()], tag
             color_code = match.group(1)
-            current_tag = color_code if color_code in self.ANSI_COLORS else None
-            pos = end
-
-            next_match = ansi_escape.search(text, pos)
-            if next_match:
-                text_part = text[pos:next_match.start()]
-                pos = next_match.start()
-            else:
-                text_part = text[pos:]
-                pos = len(text)
-
-            self.output_text.insert(tk.END, text_part, current_tag)
+            tag = (color_code,) if color_code in self.ANSI_COLORS else ()
+            pos = match.end()
+        if pos < len(text):
+            yield text[pos:], tag
+
+    def parse_ansi(self, text):
+        """Parse ANSI color codes and insert text with appropriate tags."""
+        for text_part, tag in self.ansi_segments(text):
+            self.output_text.insert(tk.END, text_part, tag)
         
-root = tk.Tk()
-cmd_emulator = CmdEmulator(root)
-root.mainloop()
+if __name__ == '__main__':
+    root = tk.Tk()
+    cmd_emulator = CmdEmulator(root)
+    root.mainloop()
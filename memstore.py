@@ -0,0 +1,186 @@
+import heapq
+from bisect import bisect_left, insort
+from keyvalue import rowKey, cellKey, PUT
+
+CELL_OVERHEAD = 48
+
+# La MemStore mantiene los row_Id ordenados por bytes (como HBase): cada fila nueva se
+# inserta en orden y los scans y flushes recorren las filas sin volver a ordenar toda la
+# MemStore. data permite acceder a una fila en O(1).
+#
+# Cada celda guarda el número de escritura (seq) con el que se insertó (ver mvcc.py). Las
+# lecturas reciben un readPoint e ignoran las celdas posteriores, así que un scan puede
+# recorrer la MemStore mientras otros hilos siguen escribiendo en ella. Por eso los borrados
+# tampoco descartan celdas: solo agregan el tombstone, que se aplica al leer.
+
+class SortedList:
+    # Lista ordenada por tramos: la búsqueda es O(log n) y cada inserción solo desplaza los
+    # elementos de un tramo de como mucho 2 * LOAD elementos, sin importar el tamaño total
+    LOAD = 512
+
+    def __init__(self):
+        self.chunks = []
+        self.maxes = []
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return self.irange()
+
+    def add(self, item):
+        if not self.chunks:
+            self.chunks.append([item])
+            self.maxes.append(item)
+        else:
+            i = bisect_left(self.maxes, item)
+            if i == len(self.maxes):
+                i -= 1
+                self.chunks[i].append(item)
+                self.maxes[i] = item
+            else:
+                insort(self.chunks[i], item)
+            chunk = self.chunks[i]
+            if len(chunk) > 2 * self.LOAD:
+                self.chunks[i:i + 1] = [chunk[:self.LOAD], chunk[self.LOAD:]]
+                self.maxes[i:i + 1] = [chunk[self.LOAD - 1], chunk[-1]]
+        self.length += 1
+
+    def irange(self, start=None):
+        # Recorre en orden los elementos >= start
+        i = bisect_left(self.maxes, start) if start is not None else 0
+        chunks = self.chunks[i:]
+        if not chunks:
+            return
+        # Cada tramo se copia antes de recorrerlo: una inserción concurrente no desplaza los elementos
+        yield from chunks[0][bisect_left(chunks[0], start) if start is not None else 0:]
+        for chunk in chunks[1:]:
+            yield from chunk[:]
+
+class MemStore:
+    def __init__(self):
+        self.data = {}
+        self.keys = SortedList()
+        self.deletes = SortedList()
+        self.puts = 0
+        # La mayor cantidad de versiones de una columna (ver HBase.count)
+        self.maxVersions = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.puts + len(self.deletes)
+
+    def isEmpty(self):
+        return not self.data and not self.deletes
+
+    def put(self, rowId, cf, column, timestamp, value, seq=0):
+        # La fila se agrega al índice después de sus celdas, para que un scan nunca encuentre una fila vacía
+        new = rowId not in self.data
+        versions = self.data.setdefault(rowId, {}).setdefault(cf, {}).setdefault(column, {})
+        self.puts += timestamp not in versions
+        versions[timestamp] = (seq, value)
+        self.maxVersions = max(self.maxVersions, len(versions))
+        if new:
+            self.keys.add(rowKey(rowId))
+        self.size += len(rowId) + len(cf) + len(column) + len(timestamp) + len(value) + CELL_OVERHEAD
+
+    def delete(self, rowId, cf, column, timestamp, kind, seq=0):
+        cell = (rowId, cf, column, timestamp, kind, '')
+        self.deletes.add((cellKey(cell), seq, cell))
+        self.size += len(rowId) + len(cf) + len(column) + len(timestamp) + CELL_OVERHEAD
+
+    def apply(self, rowId, cf, column, timestamp, kind, value, seq=0):
+        if kind == PUT:
+            self.put(rowId, cf, column, timestamp, value, seq)
+        else:
+            self.delete(rowId, cf, column, timestamp, kind, seq)
+
+    def rowDeletes(self, rowId, readPoint=None):
+        deletes = []
+        if not self.deletes:
+            return deletes
+        for _, seq, cell in self.deletes.irange(((rowKey(rowId),),)):
+            if cell[0] != rowId:
+                break
+            if readPoint is None or seq <= readPoint:
+                deletes.append(cell)
+        return deletes
+
+    def latest(self, rowId, cf, column):
+        # Si la fila tiene tombstones no se sabe, sin aplicarlos, si la última versión sigue visible
+        versions = self.data.get(rowId, {}).get(cf, {}).get(column)
+        if not versions or self.rowDeletes(rowId):
+            return None
+        return versions[max(versions, key=float)][1]
+
+    def putCells(self, rowId, readPoint=None):
+        families = self.data[rowId]
+        for cf in sorted(families):
+            for column in sorted(families[cf]):
+                versions = families[cf][column]
+                for ts in sorted(versions, key=float, reverse=True):
+                    seq, value = versions[ts]
+                    if readPoint is None or seq <= readPoint:
+                        yield (rowId, cf, column, ts, PUT, value)
+
+    def cells(self, startRow=None, readPoint=None):
+        # readPoint=None (flush) incluye todas las celdas
+        start = rowKey(startRow) if startRow else None
+        puts = (cell for key in self.keys.irange(start) for cell in self.putCells(key.decode('utf-8'), readPoint))
+        deletes = (cell for _, seq, cell in self.deletes.irange(((start,),) if start is not None else None)
+                   if readPoint is None or seq <= readPoint)
+        return heapq.merge(puts, deletes, key=cellKey)
+
+    def rowCells(self, rowId, readPoint=None):
+        puts = self.putCells(rowId, readPoint) if rowId in self.data else []
+        return list(heapq.merge(puts, self.rowDeletes(rowId, readPoint), key=cellKey))
+
+class TableMemStore:
+    # Una MemStore por column family (store). Los tombstones de fila (familia '') van a su
+    # propia MemStore, que se incluye en todas las lecturas. stores se copia antes de
+    # recorrerlo porque un put concurrente puede crear un store nuevo
+    def __init__(self):
+        self.stores = {}
+
+    def __len__(self):
+        return sum(len(store) for store in list(self.stores.values()))
+
+    @property
+    def size(self):
+        return sum(store.size for store in list(self.stores.values()))
+
+    def isEmpty(self):
+        return all(store.isEmpty() for store in list(self.stores.values()))
+
+    def store(self, cf):
+        if cf not in self.stores:
+            self.stores[cf] = MemStore()
+        return self.stores[cf]
+
+    def selected(self, families=None):
+        return [store for cf, store in list(self.stores.items()) if families is None or cf == '' or cf in families]
+
+    def put(self, rowId, cf, column, timestamp, value, seq=0):
+        self.store(cf).put(rowId, cf, column, timestamp, value, seq)
+
+    def delete(self, rowId, cf, column, timestamp, kind, seq=0):
+        self.store(cf).delete(rowId, cf, column, timestamp, kind, seq)
+
+    def apply(self, rowId, cf, column, timestamp, kind, value, seq=0):
+        self.store(cf).apply(rowId, cf, column, timestamp, kind, value, seq)
+
+    def latest(self, rowId, cf, column):
+        if cf not in self.stores or ('' in self.stores and self.stores[''].rowDeletes(rowId)):
+            return None
+        return self.stores[cf].latest(rowId, cf, column)
+
+    def tombstones(self):
+        return sum(len(store.deletes) for store in list(self.stores.values()))
+
+    def cells(self, startRow=None, families=None, readPoint=None):
+        return heapq.merge(*[store.cells(startRow, readPoint) for store in self.selected(families)], key=cellKey)
+
+    def rowCells(self, rowId, families=None, readPoint=None):
+        return list(heapq.merge(*[store.rowCells(rowId, readPoint) for store in self.selected(families)], key=cellKey))
+
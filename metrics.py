@@ -0,0 +1,169 @@
+import json
+import math
+import threading
+from time import time, perf_counter, sleep
+from functools import wraps
+from durable import atomicWrite
+
+# Registro de métricas de una instancia de HBase: contadores e histogramas de latencia por
+# operación y por tabla ('namespace:tabla', o '' para las operaciones que no son de una tabla).
+# Registrar una medición solo suma en un diccionario; los percentiles y los totales de todas
+# las tablas se calculan al pedir un snapshot.
+
+class Histogram:
+    # Buckets logarítmicos: SUB_BUCKETS por cada potencia de 2 de microsegundos, así que los
+    # percentiles tienen un error relativo menor a 1 / SUB_BUCKETS
+    SUB_BUCKETS = 8
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def observe(self, seconds):
+        us = seconds * 1e6
+        mantissa, exponent = math.frexp(us)
+        bucket = exponent * self.SUB_BUCKETS + int((mantissa - 0.5) * 2 * self.SUB_BUCKETS) if us > 0 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += us
+        self.min = us if self.min is None else min(self.min, us)
+        self.max = max(self.max, us)
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def upperBound(self, bucket):
+        exponent, sub = divmod(bucket, self.SUB_BUCKETS)
+        return 2 ** (exponent - 1) * (1 + (sub + 1) / self.SUB_BUCKETS)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0
+        target = self.count * p
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.upperBound(bucket), self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'avg_us': round(self.total / self.count, 2) if self.count else 0,
+            'min_us': round(self.min or 0, 2),
+            'p50_us': round(self.percentile(0.50), 2),
+            'p95_us': round(self.percentile(0.95), 2),
+            'p99_us': round(self.percentile(0.99), 2),
+            'max_us': round(self.max, 2),
+        }
+
+class MetricsRegistry:
+    ALL = '*'
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.started = time()
+        self.lock = threading.Lock()
+
+    def increment(self, name, table='', value=1):
+        with self.lock:
+            self.counters[(name, table)] = self.counters.get((name, table), 0) + value
+
+    def observe(self, name, table, seconds):
+        with self.lock:
+            histogram = self.histograms.get((name, table))
+            if histogram is None:
+                histogram = self.histograms[(name, table)] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name, table=''):
+        return Timer(self, name, table)
+
+    def recordIO(self, table, io):
+        # io: contadores de lectura acumulados por los lectores de HFiles (ver hfile.newIO)
+        for key, value in io.items():
+            if value and isinstance(value, (int, float)):
+                self.increment(f'read.{key}', table, value)
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started = time()
+
+    def snapshot(self, table=None):
+        # Con table=None incluye cada tabla y el total de todas ('*')
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+            totals = {}
+            if table is None:
+                for (name, _), histogram in histograms.items():
+                    totals.setdefault(name, Histogram()).merge(histogram)
+            result = {'uptime_seconds': round(time() - self.started, 3), 'counters': {}, 'histograms': {}}
+
+            for (name, t), value in sorted(counters.items()):
+                if table is None or t == table:
+                    result['counters'].setdefault(name, {})[t] = value
+            if table is None:
+                for tables in result['counters'].values():
+                    tables[self.ALL] = sum(tables.values())
+            for (name, t), histogram in sorted(histograms.items()):
+                if table is None or t == table:
+                    result['histograms'].setdefault(name, {})[t] = histogram.snapshot()
+            for name, total in totals.items():
+                result['histograms'][name][self.ALL] = total.snapshot()
+        return result
+
+    def dump(self, path):
+        with atomicWrite(path) as f:
+            json.dump({'timestamp': time(), **self.snapshot()}, f, indent=2)
+
+    def dumpLoop(self, path, interval):
+        while True:
+            sleep(interval)
+            try:
+                self.dump(path)
+            except OSError as e:
+                print(f'No se pudieron guardar las métricas en {path}: {e}')
+
+class Timer:
+    def __init__(self, registry, name, table):
+        self.registry = registry
+        self.name = name
+        self.table = table
+
+    def __enter__(self):
+        self.inicio = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed = perf_counter() - self.inicio
+        self.registry.observe(self.name, self.table, self.elapsed)
+
+def tableKey(table):
+    # 'tabla', 'namespace:tabla' o la tupla de verifyTable -> 'namespace:tabla'
+    if isinstance(table, tuple):
+        return f'{table[0]}:{table[1]}'
+    return table if ':' in table else f'default:{table}'
+
+def timed(operation):
+    # Decorador para métodos de HBase cuyo primer argumento es la tabla (nombre o tupla)
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, table, *args, **kwargs):
+            with self.metrics.timer(operation, tableKey(table)):
+                return method(self, table, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,188 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+# Concurrencia por tabla. Cada tabla tiene:
+#
+# - Un RWLock. Las lecturas y las escrituras de celdas (put, delete) toman el lock de lectura,
+#   así que no se bloquean entre sí; lo que cambia los HFiles o el esquema (flush, compactación,
+#   split, alter, drop, ...) toma el de escritura.
+# - Un MVCC. Las escrituras de celdas se serializan con MVCC.write(), que les asigna un número
+#   creciente (seq); las lecturas toman como readPoint el último número completado e ignoran
+#   en la MemStore las celdas posteriores. Una escritura se completa cuando su entrada del WAL
+#   está en disco (según la durabilidad del WAL) y todas las anteriores se completaron. Un scan abre una Snapshot con la lista de HFiles y
+#   la MemStore del momento y la recorre sin lock: mientras haya snapshots abiertas, los HFiles
+#   que reemplacen las compactaciones y los splits no se borran.
+
+class RWLock:
+    # Lock de lectura/escritura reentrante. Un hilo que espera para escribir bloquea a los
+    # lectores nuevos, así que las escrituras no esperan indefinidamente. El hilo que tiene el
+    # lock de escritura también puede leer, pero el de lectura no se puede convertir en escritura
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.readers = {}
+        self.writer = None
+        self.depth = 0
+        self.waiting = 0
+
+    def acquireRead(self):
+        me = threading.get_ident()
+        with self.cond:
+            if self.writer != me and me not in self.readers:
+                while self.writer is not None or self.waiting:
+                    self.cond.wait()
+            self.readers[me] = self.readers.get(me, 0) + 1
+
+    def releaseRead(self):
+        me = threading.get_ident()
+        with self.cond:
+            self.readers[me] -= 1
+            if not self.readers[me]:
+                del self.readers[me]
+                self.cond.notify_all()
+
+    def acquireWrite(self):
+        me = threading.get_ident()
+        with self.cond:
+            if self.writer == me:
+                self.depth += 1
+                return
+            if me in self.readers:
+                raise RuntimeError('No se puede tomar el lock de escritura con el de lectura tomado')
+            self.waiting += 1
+            while self.writer is not None or self.readers:
+                self.cond.wait()
+            self.waiting -= 1
+            self.writer = me
+            self.depth = 1
+
+    def releaseWrite(self):
+        with self.cond:
+            self.depth -= 1
+            if not self.depth:
+                self.writer = None
+                self.cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquireRead()
+        try:
+            yield
+        finally:
+            self.releaseRead()
+
+    @contextmanager
+    def write(self):
+        self.acquireWrite()
+        try:
+            yield
+        finally:
+            self.releaseWrite()
+
+class MVCC:
+    # deleteFiles: función que borra los HFiles retirados cuando ya no los lee ninguna snapshot
+    def __init__(self, deleteFiles):
+        self.updates = threading.Lock()
+        self.lock = threading.Lock()
+        self.completion = threading.Condition()
+        self.writePoint = 0
+        self.readPoint = 0
+        self.completed = set()
+        self.snapshots = 0
+        self.retired = []
+        self.deleteFiles = deleteFiles
+
+    @contextmanager
+    def write(self, wal=None):
+        # Las escrituras de una tabla (WAL y MemStore) se hacen de a una y en orden de seq. La
+        # espera del fsync del WAL se hace después, sin self.updates, para que las escrituras
+        # concurrentes compartan el fsync (group commit); al volver la escritura ya es visible
+        self.updates.acquire()
+        self.writePoint += 1
+        seq = self.writePoint
+        try:
+            yield seq
+        finally:
+            position = wal.written if wal is not None else 0
+            self.updates.release()
+            try:
+                if wal is not None:
+                    wal.waitFor(position)
+            finally:
+                self.complete(seq)
+
+    def complete(self, seq):
+        # El readPoint avanza hasta el mayor seq sin huecos y se espera a que alcance a este
+        with self.completion:
+            self.completed.add(seq)
+            while self.readPoint + 1 in self.completed:
+                self.readPoint += 1
+                self.completed.remove(self.readPoint)
+            self.completion.notify_all()
+            while self.readPoint < seq:
+                self.completion.wait()
+
+    def snapshot(self):
+        with self.lock:
+            self.snapshots += 1
+            return Snapshot(self, self.readPoint)
+
+    def release(self):
+        with self.lock:
+            self.snapshots -= 1
+            retired = [] if self.snapshots else self.retired
+            if not self.snapshots:
+                self.retired = []
+        if retired:
+            self.deleteFiles(retired)
+
+    def retire(self, paths):
+        # Devuelve True si los archivos se pueden borrar ya
+        with self.lock:
+            if self.snapshots:
+                self.retired += paths
+                return False
+        return True
+
+class Snapshot:
+    # Se cierra al terminar el scan o, si no se recorre hasta el final, al liberarse
+    def __init__(self, mvcc, readPoint):
+        self.mvcc = mvcc
+        self.readPoint = readPoint
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.mvcc.release()
+
+    def __del__(self):
+        self.close()
+
+def snapshotCells(cells, snapshot):
+    # Mantiene abierta la snapshot mientras se recorren las celdas
+    try:
+        yield from cells
+    finally:
+        snapshot.close()
+
+def locked(mode, flush=False):
+    # Decorador para métodos de HBase cuyo primer argumento es la tabla (nombre o tupla): los
+    # ejecuta con el lock de lectura ('read') o de escritura ('write') de la tabla. Con flush,
+    # al terminar y ya sin el lock, vuelca la MemStore si superó memstoreFlushSize
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, table, *args, **kwargs):
+            # Sin contextmanager: este wrapper se ejecuta en cada get y cada put
+            lock = self.tableLock(table)
+            acquire, release = (lock.acquireRead, lock.releaseRead) if mode == 'read' else (lock.acquireWrite, lock.releaseWrite)
+            acquire()
+            try:
+                result = method(self, table, *args, **kwargs)
+            finally:
+                release()
+            if flush:
+                self.flushIfFull(table)
+            return result
+        return wrapper
+    return decorator
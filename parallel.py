@@ -0,0 +1,69 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from hfile import openHFile, newIO, mergeIO
+from scanner import mergeCells, rowRange
+
+# Lectura en paralelo de los HFiles de un scan. Cada worker abre, decodifica y filtra por rango
+# un HFile completo; el hilo principal combina los resultados de cada región con un merge de
+# k vías, y las regiones se entregan en orden de row_Id. Con hilos los workers comparten el
+# block cache; con procesos la decodificación usa varios núcleos pero cada worker lee del disco.
+
+THREAD = 'thread'
+PROCESS = 'process'
+
+def readHFileCells(path, startRow=None, stopRow=None, cache=None):
+    # Devuelve las celdas del rango y los contadores de lectura. Es una función de módulo para que
+    # pueda ejecutarse en otro proceso
+    io = newIO()
+    with openHFile(path, cache, io) as reader:
+        cells = list(rowRange(reader.cells(startRow), startRow, stopRow))
+    return cells, io
+
+class ParallelReader:
+    def __init__(self, workers=1, mode=THREAD, cache=None):
+        if mode not in (THREAD, PROCESS):
+            raise ValueError(f"Modo de lectura '{mode}' no válido: use '{THREAD}' o '{PROCESS}'")
+        self.workers = workers
+        self.mode = mode
+        self.cache = cache if mode == THREAD else None
+        self.executor = None
+
+    def getExecutor(self):
+        if self.executor is None:
+            executorClass = ThreadPoolExecutor if self.mode == THREAD else ProcessPoolExecutor
+            self.executor = executorClass(max_workers=self.workers)
+        return self.executor
+
+    def submit(self, paths, startRow, stopRow):
+        executor = self.getExecutor()
+        return [executor.submit(readHFileCells, p, startRow, stopRow, self.cache) for p in paths]
+
+    def regionCells(self, regionPaths, startRow=None, stopRow=None, io=None):
+        # regionPaths: por cada región (en orden de row_Id) sus HFiles del más reciente al más
+        # antiguo. Se leen por adelantado como mucho tantas regiones como workers, para acotar
+        # la memoria de un scan que se corta antes de terminar
+        regionPaths = iter(regionPaths)
+        pending = deque()
+        for paths in regionPaths:
+            pending.append(self.submit(paths, startRow, stopRow))
+            if len(pending) >= self.workers:
+                break
+
+        while pending:
+            futures = pending.popleft()
+            nextPaths = next(regionPaths, None)
+            if nextPaths is not None:
+                pending.append(self.submit(nextPaths, startRow, stopRow))
+
+            sources = []
+            for future in futures:
+                cells, read = future.result()
+                if io is not None:
+                    mergeIO(io, read)
+                sources.append(cells)
+            yield from mergeCells(sources)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,16 @@
+import json
+import struct
+
+# Protocolo del servidor TCP: cada mensaje es un entero de 4 bytes (big endian) con el largo,
+# seguido de un JSON en UTF-8. Las peticiones son {"id": n, "command": "..."} y las respuestas
+# {"id": n, "result": "..."} o {"id": n, "error": "..."}.
+
+HEADER = struct.Struct('>I')
+MAX_FRAME = 16 * 1024 * 1024
+
+def encodeFrame(message):
+    payload = json.dumps(message, default=str).encode('utf-8')
+    return HEADER.pack(len(payload)) + payload
+
+def decodeFrame(payload):
+    return json.loads(payload)
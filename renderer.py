@@ -0,0 +1,93 @@
+from itertools import islice
+from tabulate import tabulate
+
+# Formato de los resultados de la API de lectura (ver results.py) para el shell: tablas con
+# tabulate y colores ANSI. Solo lo usa commandSelector.
+
+def renderError(error):
+    return f'\033[91m{error.label}: {error}\033[0m'
+
+def renderGet(result):
+    headers = ['\033[94mCOLUMN','\033[95mCELL\033[0m']
+    data = [[f'{cell.family}:{cell.column}', f'value={cell.value} timestamp={cell.timestamp}'] for cell in result]
+
+    resultMessage = tabulate(data, headers=headers, tablefmt="plain")
+    resultMessage += '\n'
+    resultMessage += f'\n\033[95m{len(result)} \033[96mrow\033[0m(s) in \033[95m{round(result.elapsed,6)} \033[0mseconds, \033[95m{result.bytesRead} \033[96mbytes\033[0m read'
+    return resultMessage
+
+def renderScan(result, limit=None, offset=None, preview=False):
+    # Con preview (sin límite explícito) solo se muestran las primeras 10 celdas y se cuentan las demás
+    offset = 0 if offset is None else max(offset - 1, 0)
+    limit = 10 if limit is not None and limit <= 0 else limit
+    cells = islice(result, offset, None)
+    shown = list(islice(cells, 10 if preview else limit))
+    remaining = sum(1 for _ in cells) if preview else 0
+
+    headers = ['\033[95mROW','\033[94mCOLUMN\033[0m+CELL']
+    data = []
+    for cell in shown:
+        data.append([cell.row,f'\033[94mcolumn\033[0m={cell.family}:{cell.column} \033[95mtimestamp\033[0m=\033[95m{cell.timestamp} \033[94mvalue\033[0m={cell.value}'])
+
+    if remaining:
+        data.append(['.', '.'])
+        data.append(['.', '.'])
+        data.append(['.', '.'])
+
+    resultMessage = tabulate(data, headers=headers, tablefmt="plain")
+    resultMessage += '\n'
+    if remaining:
+        resultMessage += f'\n\033[93mWARNING:\033[0m {remaining} row(s) more'
+
+    resultMessage += f'\n\033[95m{len(shown)} \033[96mrow\033[0m(s) in \033[95m{round(result.elapsed,6)} \033[0mseconds, \033[95m{result.bytesRead} \033[96mbytes\033[0m read'
+    return resultMessage
+
+def renderCount(rows):
+    return f'\033[95m{rows} \033[96mrow\033[0m(s)\033[0m'
+
+def renderExplain(query, result, renderSeconds, totalSeconds):
+    # Plan (qué se hizo con la MemStore y cada HFile) y costo de un get o scan ejecutado con explain
+    io = result.io
+    plan = io['plan']
+    headers = ['\033[32mREGION\033[0m','\033[32mHFILE\033[0m','\033[32mBYTES\033[0m','\033[32mACCIÓN\033[0m','\033[32mCELLS\033[0m']
+    data = [[step['region'], step['file'], '-' if step['bytes'] is None else step['bytes'], step['action'],
+             '-' if step['cells'] is None else step['cells']] for step in plan]
+
+    hfiles = [step for step in plan if step['region'] != '-']
+    actions = [step['action'] for step in hfiles]
+    memstoreCells = sum(step['cells'] or 0 for step in plan if step['region'] == '-')
+    if query == 'get':
+        returned = len(result)
+        # En un get todo lo que no es búsqueda, decodificación ni filtrado es lectura de bloques
+        read = result.elapsed - io['discovery_seconds'] - io['decode_seconds'] - io['filter_seconds']
+        filtered = io['filter_seconds']
+    else:
+        returned = io['cells']
+        source = io.get('source_seconds', 0)
+        read = source - io['discovery_seconds'] - io['decode_seconds']
+        filtered = io['read_seconds'] - source
+
+    cost = [
+        ['hfiles.considered', len(hfiles)],
+        ['hfiles.read', sum(1 for a in actions if a in ('read', 'scan'))],
+        ['hfiles.skipped_bloom', actions.count('skipped (bloom)')],
+        ['hfiles.skipped_store', actions.count('skipped (store)')],
+        ['hfiles.skipped_range', actions.count('skipped (range)')],
+        ['bytes.read', io['bytes']],
+        ['blocks.decoded', io['blocks_decoded']],
+        ['cache.hits', io['cache_hits']],
+        ['cells.read', io['cells_read'] + memstoreCells],
+        ['cells.returned', returned],
+        ['time.discovery_ms', round(io['discovery_seconds'] * 1000, 3)],
+        ['time.read_ms', round(max(read, 0) * 1000, 3)],
+        ['time.decode_ms', round(io['decode_seconds'] * 1000, 3)],
+        ['time.filter_ms', round(max(filtered, 0) * 1000, 3)],
+        ['time.render_ms', round(renderSeconds * 1000, 3)],
+        ['time.total_ms', round(totalSeconds * 1000, 3)],
+    ]
+
+    resultMessage = tabulate(data, headers=headers, tablefmt="plain")
+    resultMessage += '\n\n'
+    resultMessage += tabulate(cost, headers=['\033[32mCOSTO\033[0m','\033[32mVALOR\033[0m'], tablefmt="plain")
+    resultMessage += f'\n\n\033[95m{returned} \033[96mcell\033[0m(s) in \033[95m{round(totalSeconds,6)} \033[0mseconds'
+    return resultMessage
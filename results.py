@@ -0,0 +1,63 @@
+from time import time
+from collections import namedtuple
+
+# Resultados de la API de lectura de HBase (get, scan y count). No tienen formato: el shell
+# los convierte en texto con renderer.py, y los programas que usan HBase directamente
+# recorren las celdas sin pagar el costo de tabulate ni de los colores ANSI.
+
+Cell = namedtuple('Cell', ['row', 'family', 'column', 'timestamp', 'value'])
+
+class HBaseError(Exception):
+    label = 'ERROR'
+
+class NamespaceNotFoundException(HBaseError):
+    label = 'NamespaceNotFoundException'
+
+class TableNotFoundException(HBaseError):
+    label = 'TableNotFoundException'
+
+class TableDisabledException(HBaseError):
+    label = 'TableDisabledException'
+
+class FamilyNotFoundException(HBaseError):
+    label = 'FamilyNotFoundException'
+
+class GetResult:
+    # io: contadores de lectura (ver hfile.newIO)
+    def __init__(self, rowId, cells, io, elapsed):
+        self.rowId = rowId
+        self.cells = cells
+        self.io = io
+        self.elapsed = elapsed
+
+    @property
+    def bytesRead(self):
+        return self.io['bytes']
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+class ScanResult:
+    # Iterador de celdas: las lecturas se hacen a medida que se recorre. bytesRead y
+    # elapsed se actualizan durante el recorrido
+    def __init__(self, cells, io):
+        self.inicio = time()
+        self.source = cells
+        self.io = io
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.source)
+
+    @property
+    def bytesRead(self):
+        return self.io['bytes']
+
+    @property
+    def elapsed(self):
+        return time() - self.inicio
@@ -0,0 +1,120 @@
+import heapq
+from keyvalue import rowKey, cellKey, PUT, DELETE, DELETE_COLUMN, DELETE_FAMILY, DELETE_ROW
+
+# Etapas del pipeline de scan. Todas reciben y devuelven iteradores de celdas
+# (row_Id, familia, columna, timestamp, tipo, valor) ordenadas por row_Id, familia,
+# columna y timestamp descendente, de modo que nada se materializa antes de tiempo.
+
+def mergeCells(sources):
+    # Las fuentes van de la más reciente a la más antigua: ante una celda repetida gana la primera
+    last = None
+    for cell in heapq.merge(*sources, key=cellKey):
+        if cell[:5] == last:
+            continue
+        last = cell[:5]
+        yield cell
+
+def rowRange(cells, startRow=None, stopRow=None):
+    start = rowKey(startRow) if startRow else None
+    stop = rowKey(stopRow) if stopRow else None
+    for cell in cells:
+        key = rowKey(cell[0])
+        if start is not None and key < start:
+            continue
+        if stop is not None and key >= stop:
+            return
+        yield cell
+
+def renameFamilies(cells, families):
+    # families: nombre físico -> nombre lógico según el esquema actual. Las celdas de familias
+    # eliminadas se descartan; los tombstones de fila (familia '') pasan sin cambios
+    for cell in cells:
+        if cell[1] == '':
+            yield cell
+            continue
+        logical = families.get(cell[1])
+        if logical is None:
+            continue
+        yield cell if logical == cell[1] else (cell[0], logical, *cell[2:])
+
+def applyTombstones(cells, keepDeletes=False):
+    # Los tombstones llegan antes que las celdas que ocultan, así que basta con recordar
+    # los borrados de la fila actual
+    current = None
+    for cell in cells:
+        rowId, cf, column, ts, kind, _ = cell
+        if rowId != current:
+            current = rowId
+            rowDeleted = None
+            familyDeleted = {}
+            columnDeleted = {}
+            versionDeleted = set()
+
+        if kind == PUT:
+            t = float(ts)
+            if (rowDeleted is not None and t <= rowDeleted) \
+                    or t <= familyDeleted.get(cf, -1) \
+                    or t <= columnDeleted.get((cf, column), -1) \
+                    or (cf, column, ts) in versionDeleted:
+                continue
+            yield cell
+            continue
+
+        if kind == DELETE_ROW:
+            rowDeleted = max(rowDeleted or -1, float(ts))
+        elif kind == DELETE_FAMILY:
+            familyDeleted[cf] = max(familyDeleted.get(cf, -1), float(ts))
+        elif kind == DELETE_COLUMN:
+            columnDeleted[(cf, column)] = max(columnDeleted.get((cf, column), -1), float(ts))
+        elif kind == DELETE:
+            versionDeleted.add((cf, column, ts))
+        if keepDeletes:
+            yield cell
+
+def limitVersions(cells, maxVersions, default=3):
+    # maxVersions: número máximo de versiones por column family
+    current = None
+    versions = 0
+    for cell in cells:
+        if cell[4] != PUT:
+            yield cell
+            continue
+        if cell[:3] != current:
+            current = cell[:3]
+            versions = 0
+        versions += 1
+        if versions <= maxVersions.get(cell[1], default):
+            yield cell
+
+def projectColumns(cells, columns):
+    if not columns:
+        yield from cells
+        return
+
+    families = {c for c in columns if ':' not in c}
+    qualified = {tuple(c.split(':', 1)) for c in columns if ':' in c}
+    for cell in cells:
+        if cell[1] in families or (cell[1], cell[2]) in qualified:
+            yield cell
+
+def limitRows(cells, limit):
+    if limit is None:
+        yield from cells
+        return
+
+    rows = 0
+    current = None
+    for cell in cells:
+        if cell[0] != current:
+            if rows == limit:
+                return
+            current = cell[0]
+            rows += 1
+        yield cell
+
+def overlaps(region, startRow=None, stopRow=None):
+    if startRow and region['end_key'] is not None and rowKey(startRow) >= rowKey(region['end_key']):
+        return False
+    if stopRow and region['start_key'] is not None and rowKey(region['start_key']) >= rowKey(stopRow):
+        return False
+    return True
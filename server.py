@@ -0,0 +1,107 @@
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from hbase import HBase
+from commandSelector import commandSelector
+from protocol import HEADER, MAX_FRAME, encodeFrame, decodeFrame
+
+# Servidor TCP que expone los comandos del shell a varios clientes a la vez (el protocolo
+# se describe en protocol.py). Un cliente puede enviar varias peticiones sin esperar las
+# respuestas (pipelining); las peticiones de una conexión se ejecutan una tras otra en el
+# orden de llegada, así que un get ve el put que le precede. Los comandos se ejecutan en un
+# pool acotado de hilos para no bloquear el event loop con el acceso a disco; la
+# concurrencia es entre conexiones distintas. Los comandos concurrentes se coordinan con el
+# lock de cada tabla y el del catálogo (ver mvcc.py y catalog.py).
+
+async def readFrame(reader):
+    # Devuelve None cuando el cliente cierra la conexión
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    size, = HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f'Mensaje de {size} bytes supera el máximo de {MAX_FRAME}')
+    return decodeFrame(await reader.readexactly(size))
+
+class HBaseServer:
+    def __init__(self, hbase=None, host='127.0.0.1', port=16000, workers=8, pipelineDepth=64):
+        self.hbase = hbase or HBase()
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pipelineDepth = pipelineDepth
+        self.server = None
+        self.stats = {'connections': 0, 'requests': 0, 'errors': 0}
+
+    async def execute(self, request):
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, commandSelector, self.hbase, request['command'])
+            return {'id': request.get('id'), 'result': result}
+        except Exception as e:
+            self.stats['errors'] += 1
+            return {'id': request.get('id'), 'error': str(e)}
+
+    async def respond(self, pending, writer):
+        # Ejecuta las peticiones de la conexión de una en una, en el orden en que llegaron, y
+        # escribe cada respuesta. Si el cliente se desconecta se siguen consumiendo las
+        # peticiones para no bloquear al lector
+        connected = True
+        while True:
+            request = await pending.get()
+            if request is None:
+                return
+            response = await self.execute(request)
+            if not connected:
+                continue
+            try:
+                writer.write(encodeFrame(response))
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+    async def handle(self, reader, writer):
+        self.stats['connections'] += 1
+        # La cola acotada aplica contrapresión: si el cliente envía más de pipelineDepth
+        # peticiones sin leer las respuestas, se deja de leer del socket
+        pending = asyncio.Queue(self.pipelineDepth)
+        responder = asyncio.create_task(self.respond(pending, writer))
+        try:
+            while True:
+                request = await readFrame(reader)
+                if request is None:
+                    break
+                self.stats['requests'] += 1
+                await pending.put(request)
+        except (ValueError, ConnectionError) as e:
+            self.stats['errors'] += 1
+            print(f'Conexión cerrada: {e}')
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        return self.server
+
+    async def serve(self):
+        await self.start()
+        print(f'HBase escuchando en {self.host}:{self.port}')
+        async with self.server:
+            await self.server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor TCP de HBase')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=16000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+    try:
+        asyncio.run(HBaseServer(host=args.host, port=args.port, workers=args.workers).serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
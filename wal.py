@@ -0,0 +1,137 @@
+import os
+import json
+import threading
+from time import perf_counter
+from durable import fsyncDir
+
+# Log de escritura (WAL de cada tabla y journal del catálogo): una entrada JSON por línea.
+# append siempre pasa la línea al sistema operativo, así que si se cae el proceso no se pierde;
+# durability indica cuándo se hace fsync para que tampoco se pierda si se cae el sistema:
+#
+# - 'op': cada append hace su propio fsync antes de volver.
+# - 'batch' (group commit): append solo escribe y quien escribe llama después a waitFor, que
+#   espera a que un fsync cubra su entrada. Si no hay un fsync en curso lo hace ese mismo hilo,
+#   y cubre todas las entradas escritas hasta ese momento, así que los escritores concurrentes
+#   comparten un único fsync.
+# - 'async': waitFor no espera; un hilo de fondo llama a sync() cada cierto intervalo (ver
+#   HBase.walSyncLoop). Una caída del sistema puede perder las escrituras del último intervalo.
+
+DURABILITY_LEVELS = ('op', 'batch', 'async')
+
+class WAL:
+    # onSync: función que recibe la duración de cada fsync (para las métricas)
+    def __init__(self, path, durability='op', onSync=None):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Durabilidad '{durability}' no válida: use 'op', 'batch' o 'async'")
+        self.path = path
+        self.durability = durability
+        self.onSync = onSync
+        self.file = None
+        # lock protege el archivo; cond, el fsync en curso. written y synced cuentan entradas
+        self.lock = threading.Lock()
+        self.cond = threading.Condition()
+        self.written = 0
+        self.synced = 0
+        self.syncing = False
+
+    def append(self, entry):
+        # Devuelve la cantidad de bytes escritos. La posición de la entrada es self.written al volver
+        line = json.dumps(entry) + '\n'
+        with self.lock:
+            if self.file is None:
+                self.open()
+            self.file.write(line)
+            self.file.flush()
+            self.written += 1
+            if self.durability == 'op':
+                self.fsync(self.file.fileno())
+                self.synced = self.written
+        return len(line)
+
+    def open(self):
+        created = not os.path.exists(self.path)
+        self.file = open(self.path, 'a')
+        if created:
+            # Sin esto, una caída podría perder el archivo nuevo aunque se haya hecho fsync de su contenido
+            fsyncDir(os.path.dirname(self.path))
+
+    def fsync(self, fd):
+        inicio = perf_counter()
+        os.fsync(fd)
+        if self.onSync is not None:
+            self.onSync(perf_counter() - inicio)
+
+    def waitFor(self, position):
+        # Lo llama cada escritor al terminar, ya sin el lock de escritura de su tabla
+        if self.durability == 'batch':
+            self.sync(position)
+
+    def sync(self, position=None):
+        # Espera a que las entradas hasta position (por defecto todas las escritas) estén en disco
+        with self.cond:
+            if position is None:
+                position = self.written
+            while self.syncing and self.synced < position:
+                self.cond.wait()
+            if self.synced >= position:
+                return
+            self.syncing = True
+
+        synced = None
+        try:
+            # El fsync se hace sin el lock del archivo: mientras tanto otros hilos siguen escribiendo
+            with self.lock:
+                target = self.written
+                fd = self.file.fileno() if self.file is not None else None
+            if fd is not None:
+                self.fsync(fd)
+            synced = target
+        finally:
+            with self.cond:
+                self.syncing = False
+                if synced is not None:
+                    self.synced = max(self.synced, synced)
+                self.cond.notify_all()
+
+    def replay(self):
+        # Una escritura incompleta al final del log (caída a mitad de un append) se descarta y se
+        # corta del archivo antes de volver a escribir; si no, el siguiente append quedaría pegado
+        # a ella y el próximo replay perdería esa entrada y todas las posteriores
+        if not os.path.exists(self.path):
+            return
+        complete = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                complete += len(line)
+                yield entry
+        if complete < os.path.getsize(self.path):
+            self.truncate(complete)
+
+    def truncate(self, size):
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
+            f.flush()
+            self.fsync(f.fileno())
+
+    def reset(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        # Espera al fsync en curso, que usa el descriptor del archivo. Se cierra después de un
+        # flush (las entradas ya están en los HFiles) o al eliminar la tabla, así que no hace fsync
+        with self.cond:
+            while self.syncing:
+                self.cond.wait()
+            with self.lock:
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+                self.synced = self.written